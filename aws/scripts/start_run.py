@@ -5,10 +5,16 @@ import csv
 import hashlib
 import io
 import json
+import logging
+import math
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterable, Iterator, Literal, Sequence
+from typing import Any, Iterable, Iterator, Literal, Sequence
 
 _AWS_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(_AWS_ROOT / "src"))
@@ -16,10 +22,43 @@ sys.path.insert(0, str(_AWS_ROOT / "src"))
 from pyrolysis_aws.core.aws_clients import s3, sqs
 from pyrolysis_aws.core.config import IngestionConfig
 from pyrolysis_aws.core.ddb.runs import create_run, set_total_tiles
-from pyrolysis_aws.core.schema import TileJobMessage
+from pyrolysis_aws.core.logging import get_logger, log_structured
+from pyrolysis_aws.core.schema import RunStatus, TileJobMessage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - local runs without orjson installed
+    orjson = None
 
 ImagerySource = Literal["mapbox", "google"]
 
+_logger = get_logger(__name__)
+
+# Concurrent send_message_batch calls, and how many ready batches may queue behind them.
+_SEND_WORKERS = 32
+_MAX_PENDING_BATCHES = 64
+
+# Resends of entries SQS reports as Failed (throttling etc.), backing off min(2**n, cap) seconds.
+_SEND_RETRIES = 5
+_SEND_BACKOFF_CAP_SECONDS = 30
+
+# Cell values treated as blank when skipping empty CSV rows.
+_EMPTY_VALUES = frozenset((None, "", " "))
+
+# The CSV is downloaded as parallel ranged GETs of this size, read ahead of the parser.
+_RANGE_SIZE = 8 << 20
+_RANGE_WORKERS = 8
+
+# Upper bound of TileJobMessage.z / .zoom, checked by the row parsers.
+_MAX_ZOOM = 22
+
+
+# Positional column order the row parsers expect; trailing columns are optional.
+_SOURCE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "mapbox": ("z", "x", "y", "region"),
+    "google": ("lat", "lon", "zoom"),
+}
+
 
 def _detect_source_from_header(header: Sequence[str]) -> ImagerySource | None:
     lowered = {value.strip().lower() for value in header if value is not None}
@@ -34,7 +73,13 @@ def _iter_csv_rows(
     body: io.TextIOBase,
     *,
     source_hint: ImagerySource | None,
-) -> tuple[ImagerySource, Iterator[dict[str, str] | list[str]]]:
+) -> tuple[ImagerySource, Iterator[Sequence[str]]]:
+    """
+    Detect the imagery source and return rows in the parsers' positional order.
+
+    Header column indices are resolved once; rows are then plain `csv.reader`
+    lists (or tuples picked from them), never per-row dicts.
+    """
     reader = csv.reader(body)
     first_row = next(reader, None)
     if first_row is None:
@@ -43,8 +88,7 @@ def _iter_csv_rows(
     detected = _detect_source_from_header(first_row)
     if detected:
         fieldnames = [value.strip().lower() for value in first_row]
-        dict_reader = csv.DictReader(body, fieldnames=fieldnames)
-        return detected, iter(dict_reader)
+        return detected, _reorder_rows(reader, fieldnames, _SOURCE_COLUMNS[detected])
 
     if source_hint is None:
         raise ValueError(
@@ -59,99 +103,326 @@ def _iter_csv_rows(
     return source_hint, row_iter()
 
 
-def _parse_mapbox_row(row: dict[str, str] | list[str]) -> tuple[int, int, int, str | None]:
-    if isinstance(row, dict):
-        z = int(row["z"])
-        x = int(row["x"])
-        y = int(row["y"])
-        region = row.get("region") or None
-        return z, x, y, region
+def _reorder_rows(
+    reader: Iterator[list[str]],
+    fieldnames: list[str],
+    columns: tuple[str, ...],
+) -> Iterator[Sequence[str]]:
+    present = [column for column in columns if column in fieldnames]
+    indices = [fieldnames.index(column) for column in present]
+    if len(present) == len(columns) and indices == list(range(len(indices))):
+        # Header already matches positional order; rows pass through untouched
+        return reader
+    return _pick_columns(reader, indices)
+
+
+def _pick_columns(reader: Iterator[list[str]], indices: list[int]) -> Iterator[Sequence[str]]:
+    pick = itemgetter(*indices)
+    width = max(indices) + 1
+    padding = [""] * width
+    for row in reader:
+        if len(row) < width:
+            # Missing trailing cells read as empty; all-empty rows are skipped downstream
+            row = row + padding[len(row) :]
+        yield pick(row)
+
+
+def _parse_mapbox_row(row: Sequence[str]) -> tuple[int, int, int, str | None]:
     if len(row) < 3:
         raise ValueError("Mapbox CSV rows must have z,x,y (and optional region)")
     z = int(row[0])
     x = int(row[1])
     y = int(row[2])
+    # Mirrors the TileJobMessage Field constraints, which only run with --validate
+    if not 0 <= z <= _MAX_ZOOM or x < 0 or y < 0:
+        raise ValueError(f"Mapbox tile out of range: z={z} x={x} y={y}")
     region = row[3] if len(row) > 3 and row[3] else None
     return z, x, y, region
 
 
-def _parse_google_row(row: dict[str, str] | list[str]) -> tuple[float, float, int | None]:
-    if isinstance(row, dict):
-        lat = float(row["lat"])
-        lon = float(row["lon"])
-        zoom_raw = row.get("zoom") or None
-        zoom = int(zoom_raw) if zoom_raw not in (None, "") else None
-        return lat, lon, zoom
+def _parse_google_row(row: Sequence[str]) -> tuple[float, float, int | None]:
     if len(row) < 2:
         raise ValueError("Google CSV rows must have lat,lon (and optional zoom)")
     lat = float(row[0])
     lon = float(row[1])
+    # float() accepts "nan"/"inf", which would format as bare nan/inf: not JSON
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        raise ValueError(f"Google CSV lat/lon must be finite, got {row[0]!r},{row[1]!r}")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Google coordinates out of range: lat={lat} lon={lon}")
     zoom = int(row[2]) if len(row) > 2 and row[2] else None
+    if zoom is not None and not 0 <= zoom <= _MAX_ZOOM:
+        raise ValueError(f"Google zoom out of range: {zoom}")
     return lat, lon, zoom
 
 
 def _iter_messages(
-    rows: Iterable[dict[str, str] | list[str]],
+    rows: Iterable[Sequence[str]],
     *,
     run_id: str,
     source: ImagerySource,
     source_bucket: str,
     source_key: str,
-) -> Iterator[TileJobMessage]:
+    validate: bool = False,
+) -> Iterator[str]:
+    """
+    Yield encoded TileJobMessage bodies ready to send to SQS.
+
+    Bodies are formatted straight from templates whose field order and omitted
+    None fields match `TileJobMessage.model_dump(exclude_none=True)`; run-level
+    fields are encoded once per run into a shared prefix. Pydantic validation is
+    only run when `validate` is set, since every value is already typed by the
+    row parsers.
+    """
+    source_json = _encode_json({"bucket": source_bucket, "key": source_key})
+    prefix = _RUN_PREFIX % (_encode_json(run_id), _encode_json(source), source_json)
+    # The prefix is spliced into %-templates below, so escape any literal %
+    prefix = prefix.replace("%", "%%")
+    iter_bodies = _iter_mapbox_bodies if source == "mapbox" else _iter_google_bodies
+    bodies = iter_bodies(rows, prefix=prefix)
+
+    if not validate:
+        yield from bodies
+        return
+
+    for body in bodies:
+        TileJobMessage.model_validate_json(body)
+        yield body
+
+
+# The per-source loops below are specialized on purpose: the source is fixed for a
+# run, so the branch and parser lookup are hoisted out of the per-row path.
+
+# Run-level fields, identical on every message of a run
+_RUN_PREFIX = '{"run_id":%s,"imagery_source":%s,"source":%s,'
+
+# Per-row suffixes appended to the escaped run prefix
+_MAPBOX_FIELDS = '"z":%d,"x":%d,"y":%d}'
+_MAPBOX_REGION_FIELDS = '"z":%d,"x":%d,"y":%d,"region":%s}'
+# %r of a finite float (see _parse_google_row) is its shortest round-trip repr,
+# which is also valid JSON
+_GOOGLE_FIELDS = '"lat":%r,"lon":%r}'
+_GOOGLE_ZOOM_FIELDS = '"lat":%r,"lon":%r,"zoom":%d}'
+
+
+def _iter_mapbox_bodies(
+    rows: Iterable[Sequence[str]],
+    *,
+    prefix: str,
+) -> Iterator[str]:
+    is_blank = _EMPTY_VALUES.issuperset
+    parse = _parse_mapbox_row
+    body = prefix + _MAPBOX_FIELDS
+    region_body = prefix + _MAPBOX_REGION_FIELDS
     for row in rows:
-        if isinstance(row, dict):
-            if all(value in (None, "", " ") for value in row.values()):
-                continue
+        if is_blank(row):
+            continue
+
+        z, x, y, region = parse(row)
+        if region is None:
+            yield body % (z, x, y)
         else:
-            if all(value in (None, "", " ") for value in row):
-                continue
-
-        if source == "mapbox":
-            z, x, y, region = _parse_mapbox_row(row)
-            payload = {
-                "run_id": run_id,
-                "imagery_source": "mapbox",
-                "z": z,
-                "x": x,
-                "y": y,
-                "region": region,
-                "source": {"bucket": source_bucket, "key": source_key},
-            }
+            yield region_body % (z, x, y, _encode_json(region))
+
+
+def _iter_google_bodies(
+    rows: Iterable[Sequence[str]],
+    *,
+    prefix: str,
+) -> Iterator[str]:
+    is_blank = _EMPTY_VALUES.issuperset
+    parse = _parse_google_row
+    body = prefix + _GOOGLE_FIELDS
+    zoom_body = prefix + _GOOGLE_ZOOM_FIELDS
+    for row in rows:
+        if is_blank(row):
+            continue
+
+        lat, lon, zoom = parse(row)
+        if zoom is None:
+            yield body % (lat, lon)
         else:
-            lat, lon, zoom = _parse_google_row(row)
-            payload = {
-                "run_id": run_id,
-                "imagery_source": "google",
-                "lat": lat,
-                "lon": lon,
-                "zoom": zoom,
-                "source": {"bucket": source_bucket, "key": source_key},
-            }
+            yield zoom_body % (lat, lon, zoom)
+
 
-        yield TileJobMessage.model_validate(payload)
+def _encode_json(value: Any) -> str:
+    """Serialize a value to compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
 
 
 def _send_batch(queue_url: str, entries: list[dict[str, str]]) -> None:
-    if not entries:
-        return
-    response = sqs.send_message_batch(QueueUrl=queue_url, Entries=entries)
-    failures = response.get("Failed", [])
-    if failures:
-        raise RuntimeError(f"SQS batch send failed: {failures}")
+    """
+    Send one SQS batch, resending only the entries SQS reports as failed.
+
+    Partial failures are normal under throttling, so failed entries are retried
+    with exponential backoff; raises once retries are exhausted or SQS blames
+    the entries themselves (SenderFault), which a resend wouldn't fix.
+    """
+    by_id = {entry["Id"]: entry for entry in entries}
+    for retry in range(_SEND_RETRIES + 1):
+        if not entries:
+            return
+        response = sqs.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        failures = response.get("Failed", [])
+        if not failures:
+            return
+        rejected = [failure for failure in failures if failure.get("SenderFault")]
+        if rejected:
+            raise RuntimeError(f"SQS rejected {len(rejected)} entries: {rejected}")
+        if retry == _SEND_RETRIES:
+            break
+        delay = min(2**retry, _SEND_BACKOFF_CAP_SECONDS)
+        log_structured(
+            _logger,
+            logging.WARNING,
+            "SQS batch retry",
+            attempt=retry + 1,
+            failed_count=len(failures),
+            error_code=failures[0].get("Code"),
+            delay_s=delay,
+        )
+        time.sleep(delay)
+        entries = [by_id[failure["Id"]] for failure in failures]
+    raise RuntimeError(
+        f"SQS batch send failed for {len(failures)} entries after {_SEND_RETRIES} retries: {failures}"
+    )
+
+
+class _BatchSender:
+    """
+    Dispatch SQS batches on a thread pool so ingestion isn't bound by per-batch RTT.
+
+    Up to `max_pending` batches may be queued or in flight; `submit` only blocks
+    once that limit is reached, so the producer keeps parsing while acks are
+    outstanding and memory stays bounded regardless of CSV size. Each worker
+    retries its own failed entries (see `_send_batch`), so a send error here
+    is final and surfaces from `submit` or `close`.
+    """
+
+    def __init__(
+        self,
+        queue_url: str,
+        *,
+        workers: int = _SEND_WORKERS,
+        max_pending: int = _MAX_PENDING_BATCHES,
+    ) -> None:
+        self._queue_url = queue_url
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sqs-send")
+        self._slots = threading.Semaphore(max_pending)
+        self._futures: deque[Future[None]] = deque()
+
+    def submit(self, entries: list[dict[str, str]]) -> None:
+        self._slots.acquire()
+        future = self._executor.submit(_send_batch, self._queue_url, entries)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+        # Reap finished batches in submission order; never wait on an ack here
+        while self._futures and self._futures[0].done():
+            self._futures.popleft().result()
+
+    def close(self) -> None:
+        """Wait for in-flight batches, re-raising the first send failure."""
+        try:
+            while self._futures:
+                self._futures.popleft().result()
+        except BaseException:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        self._executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        """Drop queued batches without surfacing send failures; for error paths."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
 
 
 def _compute_run_id(bucket: str, key: str, etag: str) -> str:
     raw = f"{bucket}:{key}:{etag}".encode("utf-8")
-    digest = hashlib.sha1(raw).hexdigest()[:12]
+    # Identifier only, not a security boundary; lets FIPS-mode OpenSSL builds serve it too
+    digest = hashlib.sha1(raw, usedforsecurity=False).hexdigest()[:12]
     return f"run_{digest}"
 
 
+class _ChunkedReader(io.RawIOBase):
+    """
+    Raw binary stream over an iterator of byte blocks.
+
+    TextIOWrapper pulls 8 KiB at a time; serving those reads from large
+    pre-fetched blocks keeps network reads (and the botocore call overhead
+    behind each one) down to one per block.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._current = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._current:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk)
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
+
+
+def _get_s3_range(bucket: str, key: str, start: int, end: int, etag: str) -> bytes:
+    kwargs: dict[str, str] = {"Range": f"bytes={start}-{end}"}
+    if etag:
+        # Fail instead of stitching together ranges from two versions of the object
+        kwargs["IfMatch"] = etag
+    response = s3.get_object(Bucket=bucket, Key=key, **kwargs)
+    return response["Body"].read()
+
+
+def _iter_s3_ranges(bucket: str, key: str, *, size: int, etag: str) -> Iterator[bytes]:
+    """
+    Yield the object body in order, keeping up to _RANGE_WORKERS ranged GETs in flight.
+
+    A single GET streams at whatever one TCP connection sustains; fetching ranges
+    ahead of the parser on parallel connections overlaps that latency.
+    """
+    starts = iter(range(0, size, _RANGE_SIZE))
+
+    with ThreadPoolExecutor(max_workers=_RANGE_WORKERS, thread_name_prefix="s3-range") as executor:
+        pending: deque[Future[bytes]] = deque()
+
+        def schedule_next() -> None:
+            start = next(starts, None)
+            if start is not None:
+                end = min(start + _RANGE_SIZE, size) - 1
+                pending.append(executor.submit(_get_s3_range, bucket, key, start, end, etag))
+
+        for _ in range(_RANGE_WORKERS):
+            schedule_next()
+
+        while pending:
+            chunk = pending.popleft().result()
+            schedule_next()
+            yield chunk
+
+
 def _get_s3_body(bucket: str, key: str) -> tuple[io.TextIOBase, str]:
     head = s3.head_object(Bucket=bucket, Key=key)
-    etag = head.get("ETag", "").strip('"')
-    response = s3.get_object(Bucket=bucket, Key=key)
-    body = response["Body"]
-    text_stream = io.TextIOWrapper(body, encoding="utf-8-sig")
+    raw_etag = head.get("ETag", "")
+    etag = raw_etag.strip('"')
+    chunks = _iter_s3_ranges(bucket, key, size=head["ContentLength"], etag=raw_etag)
+    text_stream = io.TextIOWrapper(_ChunkedReader(chunks), encoding="utf-8-sig", newline="")
+    return text_stream, etag
+
+
+def _get_local_body(path: Path) -> tuple[io.TextIOBase, str]:
+    """Open a local CSV for debugging runs; size+mtime stand in for the S3 ETag."""
+    stat = path.stat()
+    etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    text_stream = io.TextIOWrapper(path.open("rb"), encoding="utf-8-sig", newline="")
     return text_stream, etag
 
 
@@ -166,7 +437,18 @@ def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
         default=None,
         help="Imagery source if CSV header is missing",
     )
+    parser.add_argument(
+        "--local-file",
+        type=Path,
+        default=None,
+        help="Read the CSV from this local path instead of S3 (--bucket/--key still label the run)",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Validate only, no SQS sends")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate every message against TileJobMessage (implied by --dry-run)",
+    )
     return parser.parse_args(argv)
 
 
@@ -174,43 +456,64 @@ def main(argv: Sequence[str] | None = None) -> int:
     args = _parse_args(argv or sys.argv[1:])
     config = IngestionConfig.from_env()
 
-    text_stream, etag = _get_s3_body(args.bucket, args.key)
+    if args.local_file is not None:
+        text_stream, etag = _get_local_body(args.local_file)
+    else:
+        text_stream, etag = _get_s3_body(args.bucket, args.key)
     run_id = args.run_id or _compute_run_id(args.bucket, args.key, etag)
 
-    create_run(
-        config.runs_table,
-        run_id,
-        args.bucket,
-        args.key,
-        total_tiles=0,
-    )
-
     source, rows = _iter_csv_rows(text_stream, source_hint=args.source)
 
     total = 0
     batch: list[dict[str, str]] = []
     start = time.time()
-
-    for message in _iter_messages(
-        rows,
-        run_id=run_id,
-        source=source,
-        source_bucket=args.bucket,
-        source_key=args.key,
-    ):
-        total += 1
-        body = json.dumps(message.model_dump(exclude_none=True))
-        batch.append({"Id": str(total), "MessageBody": body})
-
-        if len(batch) == 10:
-            if not args.dry_run:
-                _send_batch(config.tile_jobs_queue_url, batch)
-            batch = []
-
-    if batch and not args.dry_run:
-        _send_batch(config.tile_jobs_queue_url, batch)
-
-    set_total_tiles(config.runs_table, run_id, total_tiles=total)
+    sender = None if args.dry_run else _BatchSender(config.tile_jobs_queue_url)
+    # The run item is written just before the first send, so workers never see a
+    # run without tiles behind it. total_tiles is only written once it is known.
+    awaiting_total = False
+
+    try:
+        for body in _iter_messages(
+            rows,
+            run_id=run_id,
+            source=source,
+            source_bucket=args.bucket,
+            source_key=args.key,
+            validate=args.validate or args.dry_run,
+        ):
+            total += 1
+            batch.append({"Id": str(total), "MessageBody": body})
+
+            if len(batch) == 10:
+                if sender is not None:
+                    if not awaiting_total:
+                        create_run(config.runs_table, run_id, args.bucket, args.key)
+                        awaiting_total = True
+                    sender.submit(batch)
+                batch = []
+
+        if not awaiting_total:
+            # Nothing was sent yet, so the run can start out with its final count
+            create_run(
+                config.runs_table,
+                run_id,
+                args.bucket,
+                args.key,
+                total_tiles=total,
+                status=RunStatus.RUNNING if total else RunStatus.COMPLETED,
+            )
+        if batch and sender is not None:
+            sender.submit(batch)
+        if sender is not None:
+            sender.close()
+    except BaseException:
+        # Keep the original error; a batch failure from close() would replace it
+        if sender is not None:
+            sender.abort()
+        raise
+
+    if awaiting_total:
+        set_total_tiles(config.runs_table, run_id, total_tiles=total)
 
     elapsed = time.time() - start
     print(f"run_id={run_id} source={source} total={total} elapsed={elapsed:.1f}s")
@@ -1,4 +1,4 @@
 from .boto import ddb, s3, secrets, sqs
-from .secrets import get_secret_json
+from .secrets import get_secret_json, invalidate_secrets
 
-__all__ = ["ddb", "s3", "secrets", "sqs", "get_secret_json"]
+__all__ = ["ddb", "s3", "secrets", "sqs", "get_secret_json", "invalidate_secrets"]
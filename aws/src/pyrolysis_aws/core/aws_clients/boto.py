@@ -4,14 +4,30 @@ import os
 
 try:  # pragma: no cover - boto3 is provided in AWS runtime
     import boto3
+    from botocore.config import Config
 except Exception as exc:  # pragma: no cover - local dev without boto3
     raise RuntimeError("boto3 is required for AWS Lambda runtime") from exc
 
 _REGION = os.getenv("AWS_REGION", "us-east-1")
 
-sqs = boto3.client("sqs", region_name=_REGION)
-ddb = boto3.client("dynamodb", region_name=_REGION)
-s3 = boto3.client("s3", region_name=_REGION)
-secrets = boto3.client("secretsmanager", region_name=_REGION)
+# Sized for the concurrent SQS sends / S3 range reads; the botocore default of 10
+# pooled connections would silently serialize them.
+_CLIENT_CONFIG = Config(
+    region_name=_REGION,
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+
+# One explicit session rather than boto3's implicit default, which takes a global
+# lock on first use from each thread.
+_session = boto3.session.Session()
+
+sqs = _session.client("sqs", config=_CLIENT_CONFIG)
+ddb = _session.client("dynamodb", config=_CLIENT_CONFIG)
+s3 = _session.client("s3", config=_CLIENT_CONFIG)
+secrets = _session.client("secretsmanager", config=_CLIENT_CONFIG)
 
 __all__ = ["sqs", "ddb", "s3", "secrets"]
@@ -1,34 +1,53 @@
 from __future__ import annotations
 
 import base64
-import json
+import threading
 import time
 from typing import Any
 
+import orjson
+
 from .boto import secrets
 
 _cache: dict[str, tuple[float, dict[str, Any]]] = {}
+# Serializes cache misses so concurrent callers share one GetSecretValue call
+_cache_lock = threading.Lock()
 
 
 def _parse_secret(response: dict[str, Any]) -> dict[str, Any]:
     if "SecretString" in response and response["SecretString"]:
-        return json.loads(response["SecretString"])
+        return orjson.loads(response["SecretString"])
     if "SecretBinary" in response and response["SecretBinary"]:
-        decoded = base64.b64decode(response["SecretBinary"]).decode("utf-8")
-        return json.loads(decoded)
+        # orjson parses UTF-8 bytes directly; no intermediate str decode needed
+        return orjson.loads(base64.b64decode(response["SecretBinary"]))
     raise RuntimeError("Secret has no SecretString or SecretBinary")
 
 
 def get_secret_json(secret_id: str, ttl_seconds: int = 900) -> dict[str, Any]:
-    now = time.time()
     cached = _cache.get(secret_id)
-    if cached and cached[0] > now:
+    if cached and cached[0] > time.monotonic():
         return cached[1]
 
-    response = secrets.get_secret_value(SecretId=secret_id)
-    value = _parse_secret(response)
-    _cache[secret_id] = (now + ttl_seconds, value)
-    return value
+    with _cache_lock:
+        # Another thread may have refreshed the entry while we waited
+        cached = _cache.get(secret_id)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+
+        response = secrets.get_secret_value(SecretId=secret_id)
+        value = _parse_secret(response)
+        _cache[secret_id] = (now + ttl_seconds, value)
+        return value
+
+
+def invalidate_secrets(secret_id: str | None = None) -> None:
+    """Drop cached secret values (one secret, or all) so the next read refetches them."""
+    with _cache_lock:
+        if secret_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(secret_id, None)
 
 
-__all__ = ["get_secret_json"]
+__all__ = ["get_secret_json", "invalidate_secrets"]
@@ -1,3 +1,3 @@
-from .settings import BaseConfig, IngestionConfig, WorkerConfig
+from .settings import BaseConfig, IngestionConfig, WorkerConfig, reset_for_tests
 
-__all__ = ["BaseConfig", "IngestionConfig", "WorkerConfig"]
+__all__ = ["BaseConfig", "IngestionConfig", "WorkerConfig", "reset_for_tests"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from dataclasses import dataclass, field
@@ -68,6 +69,7 @@ class BaseConfig:
         }
 
     @classmethod
+    @functools.cache
     def from_env(cls: type[T]) -> T:
         return cls(**cls._base_kwargs())
 
@@ -77,6 +79,7 @@ class IngestionConfig(BaseConfig):
     tile_jobs_queue_url: str = field(default="")
 
     @classmethod
+    @functools.cache
     def from_env(cls) -> "IngestionConfig":
         kwargs = cls._base_kwargs()
         kwargs["tile_jobs_queue_url"] = _require("TILE_JOBS_QUEUE_URL")
@@ -85,9 +88,26 @@ class IngestionConfig(BaseConfig):
 
 @dataclass(frozen=True, slots=True)
 class WorkerConfig(BaseConfig):
+    # Tiles whose encoded image is smaller than this skip OpenAI; 0 disables
+    prefilter_min_bytes: int = field(default=0)
+
     @classmethod
+    @functools.cache
     def from_env(cls) -> "WorkerConfig":
-        return cls(**cls._base_kwargs())
+        kwargs = cls._base_kwargs()
+        kwargs["prefilter_min_bytes"] = int(os.getenv("PIPELINE_PREFILTER_MIN_BYTES", "0"))
+        return cls(**kwargs)
+
+
+def reset_for_tests() -> None:
+    """
+    Drop cached configs so the next `from_env()` re-reads the environment.
+
+    `from_env` is memoized per class: configs are frozen and the environment
+    doesn't change within a process, so warm invocations reuse the first load.
+    """
+    for config_cls in (BaseConfig, IngestionConfig, WorkerConfig):
+        config_cls.from_env.cache_clear()
 
 
-__all__ = ["BaseConfig", "IngestionConfig", "WorkerConfig"]
+__all__ = ["BaseConfig", "IngestionConfig", "WorkerConfig", "reset_for_tests"]
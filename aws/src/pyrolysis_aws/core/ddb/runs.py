@@ -14,22 +14,29 @@ def create_run(
     run_id: str,
     source_bucket: str,
     source_key: str,
-    total_tiles: int,
+    total_tiles: int | None = None,
     *,
     status: RunStatus = RunStatus.RUNNING,
     now_epoch: int | None = None,
 ) -> dict[str, Any]:
+    """
+    Create the run item, failing if it already exists.
+
+    `total_tiles` may be omitted when the tile count isn't known yet (e.g. while
+    ingestion is still streaming); it is then left unset until `set_total_tiles`.
+    """
     created_at = now_epoch if now_epoch is not None else int(time.time())
     item = {
         "run_id": {"S": run_id},
         "status": {"S": status.value},
-        "total_tiles": {"N": str(total_tiles)},
         "completed_tiles": {"N": "0"},
         "failed_tiles": {"N": "0"},
         "source_bucket": {"S": source_bucket},
         "source_key": {"S": source_key},
         "created_at_epoch": {"N": str(created_at)},
     }
+    if total_tiles is not None:
+        item["total_tiles"] = {"N": str(total_tiles)}
     ddb.put_item(
         TableName=table_name,
         Item=item,
@@ -96,6 +103,8 @@ def set_total_tiles(
         Key={"run_id": {"S": run_id}},
         UpdateExpression="SET total_tiles = :total",
         ExpressionAttributeValues={":total": {"N": str(total_tiles)}},
+        # Never create a bare item if the run was never created
+        ConditionExpression="attribute_exists(run_id)",
         ReturnValues="UPDATED_NEW",
     )
     return response.get("Attributes", {})
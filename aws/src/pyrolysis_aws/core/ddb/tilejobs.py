@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import time
+from decimal import Decimal
 from typing import Any
 
 from botocore.exceptions import ClientError
-from boto3.dynamodb.types import TypeDeserializer
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 
 from ..aws_clients.boto import ddb
 from ..schema import ClaimResult, ClaimResultData, JobStatus, S3Checkpoint, TileJobMessage
@@ -16,16 +17,105 @@ def _job_key(run_id: str, tile_id: str) -> dict[str, dict[str, str]]:
 
 def _ensure_tile_id(message: TileJobMessage) -> str:
     """Get the canonical tile_id for a message."""
-    return message.get_tile_id()
+    return message.tile_id
 
 
 _DESERIALIZER = TypeDeserializer()
+_SERIALIZER = TypeSerializer()
 
 
 def _deserialize_item(item: dict[str, Any]) -> dict[str, Any]:
     return {key: _DESERIALIZER.deserialize(value) for key, value in item.items()}
 
 
+def _serialize_map(payload: dict) -> dict[str, Any]:
+    """Serialize a dict to a DynamoDB M attribute, dropping None values from every map."""
+    return _SERIALIZER.serialize(_to_serializable(payload))
+
+
+def _to_serializable(value: Any) -> Any:
+    """
+    Prepare a value for TypeSerializer, which rejects floats and keeps None as NULL.
+
+    Floats become Decimal via their repr, and None map values are dropped; None
+    list items stay NULL. openai_usage["details"] comes from pydantic-ai as-is,
+    so its values can be any of these.
+    """
+    if isinstance(value, dict):
+        return {key: _to_serializable(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_to_serializable(item) for item in value]
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return value
+
+
+# Static attribute values shared across calls; botocore only reads request params.
+_STATUS_PROCESSING = {"S": JobStatus.PROCESSING.value}
+_STATUS_PENDING = {"S": JobStatus.PENDING.value}
+_STATUS_FAILED = {"S": JobStatus.FAILED.value}
+_STATUS_COMPLETED = {"S": JobStatus.COMPLETED.value}
+_N_ONE = {"N": "1"}
+_N_ZERO = {"N": "0"}
+
+# "status" is a DynamoDB reserved keyword; every status write goes through #status.
+_STATUS_NAMES = {"#status": "status"}
+
+_CLAIM_UPDATE_BASE = (
+    "SET #status = :processing, "
+    "attempts = if_not_exists(attempts, :zero) + :one, "
+    "lock_until_epoch = :lock, "
+    "started_at_epoch = if_not_exists(started_at_epoch, :now), "
+    "last_claimed_at_epoch = :last_claimed, "
+    "imagery_source = if_not_exists(imagery_source, :source)"
+)
+_CLAIM_UPDATE_MAPBOX = (
+    _CLAIM_UPDATE_BASE
+    + ", z = if_not_exists(z, :z), x = if_not_exists(x, :x), y = if_not_exists(y, :y)"
+)
+_CLAIM_UPDATE_GOOGLE = (
+    _CLAIM_UPDATE_BASE
+    + ", lat = if_not_exists(lat, :lat), "
+    "lon = if_not_exists(lon, :lon), "
+    "zoom = if_not_exists(zoom, :zoom)"
+)
+
+# Keyed by (imagery_source, has_region)
+_CLAIM_UPDATE_EXPR = {
+    ("mapbox", False): _CLAIM_UPDATE_MAPBOX,
+    # "region" is a DynamoDB reserved keyword; use an expression attribute name.
+    ("mapbox", True): _CLAIM_UPDATE_MAPBOX + ", #region = if_not_exists(#region, :region)",
+    ("google", False): _CLAIM_UPDATE_GOOGLE,
+}
+
+# Keyed by has_region
+_CLAIM_EXPR_NAMES = {
+    False: _STATUS_NAMES,
+    True: {"#status": "status", "#region": "region"},
+}
+
+# Condition allows claiming if:
+# 1. Item doesn't exist (new job)
+# 2. Status is PENDING or FAILED (available)
+# 3. Status is PROCESSING but lock is stale (expired or missing)
+_CLAIM_CONDITION_EXPR = (
+    "attribute_not_exists(#status) OR "
+    "#status IN (:pending, :failed) OR "
+    "(#status = :processing AND ("
+    "attribute_not_exists(lock_until_epoch) OR lock_until_epoch < :now))"
+)
+
+_COMPLETE_UPDATE_BASE = (
+    "SET #status = :status, finished_at_epoch = :finished, "
+    "s3_bucket = :bucket, s3_key = :key"
+)
+_CHECKPOINT_UPDATE_EXPR = "SET s3_bucket = :bucket, s3_key = :key"
+_FAIL_UPDATE_EXPR = (
+    "SET #status = :status, finished_at_epoch = :finished, "
+    "error_code = :code, error_message = :message"
+)
+
+
 def _get_job_status(table_name: str, run_id: str, tile_id: str) -> JobStatus | None:
     """Fetch current job status, returns None if item doesn't exist."""
     try:
@@ -33,7 +123,7 @@ def _get_job_status(table_name: str, run_id: str, tile_id: str) -> JobStatus | N
             TableName=table_name,
             Key=_job_key(run_id, tile_id),
             ProjectionExpression="#status",
-            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeNames=_STATUS_NAMES,
         )
         item = response.get("Item")
         if item and "status" in item:
@@ -64,76 +154,39 @@ def claim_job(
     now = now_epoch if now_epoch is not None else int(time.time())
     tile_id = _ensure_tile_id(message)
     lock_until = now + lock_seconds
+    has_region = message.imagery_source == "mapbox" and bool(message.region)
 
-    expr_names = {"#status": "status"}
     expr_values: dict[str, Any] = {
-        ":processing": {"S": JobStatus.PROCESSING.value},
-        ":pending": {"S": JobStatus.PENDING.value},
-        ":failed": {"S": JobStatus.FAILED.value},
+        ":processing": _STATUS_PROCESSING,
+        ":pending": _STATUS_PENDING,
+        ":failed": _STATUS_FAILED,
         ":now": {"N": str(now)},
         ":lock": {"N": str(lock_until)},
-        ":one": {"N": "1"},
-        ":zero": {"N": "0"},
+        ":one": _N_ONE,
+        ":zero": _N_ZERO,
         ":source": {"S": message.imagery_source},
         ":last_claimed": {"N": str(now)},
     }
 
-    update_expr = (
-        "SET #status = :processing, "
-        "attempts = if_not_exists(attempts, :zero) + :one, "
-        "lock_until_epoch = :lock, "
-        "started_at_epoch = if_not_exists(started_at_epoch, :now), "
-        "last_claimed_at_epoch = :last_claimed, "
-        "imagery_source = if_not_exists(imagery_source, :source)"
-    )
-
     if message.imagery_source == "mapbox":
-        expr_values.update(
-            {
-                ":z": {"N": str(message.z)},
-                ":x": {"N": str(message.x)},
-                ":y": {"N": str(message.y)},
-            }
-        )
-        update_expr += ", z = if_not_exists(z, :z), x = if_not_exists(x, :x), y = if_not_exists(y, :y)"
-        if message.region:
+        expr_values[":z"] = {"N": str(message.z)}
+        expr_values[":x"] = {"N": str(message.x)}
+        expr_values[":y"] = {"N": str(message.y)}
+        if has_region:
             expr_values[":region"] = {"S": message.region}
-            # "region" is a DynamoDB reserved keyword; use an expression attribute name.
-            expr_names["#region"] = "region"
-            update_expr += ", #region = if_not_exists(#region, :region)"
     else:
-        expr_values.update(
-            {
-                ":lat": {"N": str(message.lat)},
-                ":lon": {"N": str(message.lon)},
-                ":zoom": {"N": str(message.zoom)},
-            }
-        )
-        update_expr += (
-            ", lat = if_not_exists(lat, :lat), "
-            "lon = if_not_exists(lon, :lon), "
-            "zoom = if_not_exists(zoom, :zoom)"
-        )
-
-    # Condition allows claiming if:
-    # 1. Item doesn't exist (new job)
-    # 2. Status is PENDING or FAILED (available)
-    # 3. Status is PROCESSING but lock is stale (expired or missing)
-    condition_expr = (
-        "attribute_not_exists(#status) OR "
-        "#status IN (:pending, :failed) OR "
-        "(#status = :processing AND ("
-        "attribute_not_exists(lock_until_epoch) OR lock_until_epoch < :now))"
-    )
+        expr_values[":lat"] = {"N": str(message.lat)}
+        expr_values[":lon"] = {"N": str(message.lon)}
+        expr_values[":zoom"] = {"N": str(message.zoom)}
 
     try:
         response = ddb.update_item(
             TableName=table_name,
             Key=_job_key(message.run_id, tile_id),
-            UpdateExpression=update_expr,
-            ExpressionAttributeNames=expr_names,
+            UpdateExpression=_CLAIM_UPDATE_EXPR[(message.imagery_source, has_region)],
+            ExpressionAttributeNames=_CLAIM_EXPR_NAMES[has_region],
             ExpressionAttributeValues=expr_values,
-            ConditionExpression=condition_expr,
+            ConditionExpression=_CLAIM_CONDITION_EXPR,
             ReturnValues="ALL_NEW",
         )
         attrs = response.get("Attributes", {})
@@ -178,15 +231,12 @@ def complete_job(
 ) -> None:
     finished = finished_at_epoch if finished_at_epoch is not None else int(time.time())
     expr_values: dict[str, Any] = {
-        ":status": {"S": JobStatus.COMPLETED.value},
+        ":status": _STATUS_COMPLETED,
         ":finished": {"N": str(finished)},
         ":bucket": {"S": s3_bucket},
         ":key": {"S": s3_key},
     }
-    update_expr = (
-        "SET #status = :status, finished_at_epoch = :finished, "
-        "s3_bucket = :bucket, s3_key = :key"
-    )
+    update_expr = _COMPLETE_UPDATE_BASE
     if status_ai is not None:
         expr_values[":status_ai"] = {"S": status_ai}
         update_expr += ", status_ai = :status_ai"
@@ -194,7 +244,7 @@ def complete_job(
         expr_values[":reasoning"] = {"S": reasoning}
         update_expr += ", reasoning = :reasoning"
     if openai_usage is not None:
-        expr_values[":openai_usage"] = {"M": _to_ddb_map(openai_usage)}
+        expr_values[":openai_usage"] = _serialize_map(openai_usage)
         update_expr += ", openai_usage = :openai_usage"
     if claimed_at_epoch is not None:
         duration_ms = (finished - claimed_at_epoch) * 1000
@@ -205,7 +255,7 @@ def complete_job(
         TableName=table_name,
         Key=_job_key(run_id, tile_id),
         UpdateExpression=update_expr,
-        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeNames=_STATUS_NAMES,
         ExpressionAttributeValues=expr_values,
     )
 
@@ -217,7 +267,7 @@ def checkpoint_s3(
     *,
     s3_bucket: str,
     s3_key: str,
-) -> dict[str, Any]:
+) -> None:
     """
     Record S3 upload checkpoint for a job.
 
@@ -225,17 +275,15 @@ def checkpoint_s3(
     On retry, if s3_key exists, the worker can skip fetch+upload and
     download from S3 instead.
     """
-    response = ddb.update_item(
+    ddb.update_item(
         TableName=table_name,
         Key=_job_key(run_id, tile_id),
-        UpdateExpression="SET s3_bucket = :bucket, s3_key = :key",
+        UpdateExpression=_CHECKPOINT_UPDATE_EXPR,
         ExpressionAttributeValues={
             ":bucket": {"S": s3_bucket},
             ":key": {"S": s3_key},
         },
-        ReturnValues="UPDATED_NEW",
     )
-    return response.get("Attributes", {})
 
 
 def fail_job(
@@ -246,61 +294,20 @@ def fail_job(
     error_code: str,
     error_message: str,
     finished_at_epoch: int | None = None,
-) -> dict[str, Any]:
+) -> None:
     finished = finished_at_epoch if finished_at_epoch is not None else int(time.time())
-    response = ddb.update_item(
+    ddb.update_item(
         TableName=table_name,
         Key=_job_key(run_id, tile_id),
-        UpdateExpression=(
-            "SET #status = :status, finished_at_epoch = :finished, "
-            "error_code = :code, error_message = :message"
-        ),
-        ExpressionAttributeNames={"#status": "status"},
+        UpdateExpression=_FAIL_UPDATE_EXPR,
+        ExpressionAttributeNames=_STATUS_NAMES,
         ExpressionAttributeValues={
-            ":status": {"S": JobStatus.FAILED.value},
+            ":status": _STATUS_FAILED,
             ":finished": {"N": str(finished)},
             ":code": {"S": error_code},
             ":message": {"S": error_message},
         },
-        ReturnValues="UPDATED_NEW",
     )
-    return response.get("Attributes", {})
-
-
-def _to_ddb_map(payload: dict) -> dict[str, Any]:
-    converted: dict[str, Any] = {}
-    for key, value in payload.items():
-        if value is None:
-            continue
-        if isinstance(value, str):
-            converted[key] = {"S": value}
-        elif isinstance(value, bool):
-            converted[key] = {"BOOL": value}
-        elif isinstance(value, (int, float)):
-            converted[key] = {"N": str(value)}
-        elif isinstance(value, dict):
-            converted[key] = {"M": _to_ddb_map(value)}
-        elif isinstance(value, list):
-            converted[key] = {"L": [_to_ddb_value(item) for item in value]}
-        else:
-            converted[key] = {"S": str(value)}
-    return converted
-
-
-def _to_ddb_value(value: Any) -> dict[str, Any]:
-    if value is None:
-        return {"NULL": True}
-    if isinstance(value, str):
-        return {"S": value}
-    if isinstance(value, bool):
-        return {"BOOL": value}
-    if isinstance(value, (int, float)):
-        return {"N": str(value)}
-    if isinstance(value, dict):
-        return {"M": _to_ddb_map(value)}
-    if isinstance(value, list):
-        return {"L": [_to_ddb_value(item) for item in value]}
-    return {"S": str(value)}
 
 
 __all__ = ["claim_job", "complete_job", "checkpoint_s3", "fail_job"]
@@ -1,3 +1,15 @@
-from .fetchers import ImageryFetchError, fetch_google_tile, fetch_mapbox_tile, tile_center_latlon
+from .fetchers import (
+    ImageryFetchError,
+    fetch_google_tile,
+    fetch_mapbox_tile,
+    fetch_tiles_batch,
+    tile_center_latlon,
+)
 
-__all__ = ["ImageryFetchError", "fetch_google_tile", "fetch_mapbox_tile", "tile_center_latlon"]
+__all__ = [
+    "ImageryFetchError",
+    "fetch_google_tile",
+    "fetch_mapbox_tile",
+    "fetch_tiles_batch",
+    "tile_center_latlon",
+]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import functools
 import logging
 import math
-from typing import Literal
+from typing import Literal, Sequence
+from urllib.parse import urlencode
 
 import aiohttp
 
 from ..aws_clients.secrets import get_secret_json
+from ..io.http import decorrelated_backoff, status_bitmap
 
 _logger = logging.getLogger(__name__)
 
@@ -14,7 +19,39 @@ MAPBOX_TILESET = "mapbox.satellite"
 MAPBOX_FORMAT = "jpg"
 GOOGLE_BASE_URL = "https://maps.googleapis.com/maps/api/staticmap"
 
-_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRYABLE_STATUS_BITS = status_bitmap((429, 500, 502, 503, 504))
+_ERROR_BODY_PREVIEW_BYTES = 512
+
+# Shared across invocations of a warm environment so tile fetches reuse pooled,
+# already-handshaken connections. Bound to the loop that created it.
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the module-level session, creating it on first use in this loop."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=256,
+            limit_per_host=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+    return _session
+
+
+@atexit.register
+def _close_session() -> None:
+    """Close the shared session on interpreter shutdown if its loop is still usable."""
+    if _session is None or _session.closed or _session_loop is None:
+        return
+    if _session_loop.is_closed() or _session_loop.is_running():
+        return
+    _session_loop.run_until_complete(_session.close())
 
 
 class ImageryFetchError(Exception):
@@ -33,36 +70,73 @@ class ImageryFetchError(Exception):
         super().__init__(f"{source} fetch failed after {attempts} attempts: {message}")
 
 
-def _mapbox_url(z: int, x: int, y: int, token: str) -> str:
-    return (
-        f"https://api.mapbox.com/v4/{MAPBOX_TILESET}/{z}/{x}/{y}.{MAPBOX_FORMAT}"
-        f"?access_token={token}"
+_MAPBOX_URL_PREFIX = f"https://api.mapbox.com/v4/{MAPBOX_TILESET}/"
+
+
+@functools.lru_cache(maxsize=4)
+def _mapbox_query(token: str) -> str:
+    """Query string for a token; URL-escaped once per token, not per tile."""
+    return "?" + urlencode({"access_token": token})
+
+
+@functools.lru_cache(maxsize=4)
+def _google_query_suffix(api_key: str) -> str:
+    """The fixed trailing Static API parameters for a key, URL-escaped once per key."""
+    return "&" + urlencode(
+        {"size": "640x640", "scale": 2, "maptype": "satellite", "key": api_key}
     )
 
 
+def _mapbox_url(z: int, x: int, y: int, token: str) -> str:
+    return f"{_MAPBOX_URL_PREFIX}{z}/{x}/{y}.{MAPBOX_FORMAT}{_mapbox_query(token)}"
+
+
 def _google_url(lat: float, lon: float, zoom: int, api_key: str) -> str:
-    return (
-        f"{GOOGLE_BASE_URL}?center={lat},{lon}&zoom={zoom}"
-        f"&size=640x640&scale=2&maptype=satellite&key={api_key}"
-    )
+    return f"{GOOGLE_BASE_URL}?center={lat},{lon}&zoom={zoom}{_google_query_suffix(api_key)}"
+
+
+def _tile_x_to_lon(tx: int, n: int) -> float:
+    return tx / n * 360.0 - 180.0
+
+
+def _tile_y_to_lat(ty: int, n: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
 
 
 def tile_to_lonlat_bounds(x: int, y: int, z: int) -> tuple[float, float, float, float]:
     """Return (min_lon, min_lat, max_lon, max_lat) for a tile in EPSG:4326."""
     n = 2**z
+    min_lon = _tile_x_to_lon(x, n)
+    max_lon = _tile_x_to_lon(x + 1, n)
+    min_lat = _tile_y_to_lat(y + 1, n)
+    max_lat = _tile_y_to_lat(y, n)
+    return (min_lon, min_lat, max_lon, max_lat)
 
-    def tile_x_to_lon(tx: int) -> float:
-        return tx / n * 360.0 - 180.0
 
-    def tile_y_to_lat(ty: int) -> float:
-        y2 = math.pi * (1 - 2 * ty / n)
-        return math.degrees(math.atan(math.sinh(y2)))
+def tile_to_lonlat_bounds_batch(
+    xs: Sequence[int],
+    ys: Sequence[int],
+    z: int,
+) -> list[tuple[float, float, float, float]]:
+    """
+    Bounds for many tiles at one zoom, in the same order as `xs`/`ys`.
 
-    min_lon = tile_x_to_lon(x)
-    max_lon = tile_x_to_lon(x + 1)
-    min_lat = tile_y_to_lat(y + 1)
-    max_lat = tile_y_to_lat(y)
-    return (min_lon, min_lat, max_lon, max_lat)
+    Neighbouring tiles share edges, so each distinct tile-row edge latitude (the
+    costly sinh/atan part) is computed once for the whole batch.
+    """
+    if len(xs) != len(ys):
+        raise ValueError("xs and ys must have the same length")
+    n = 2**z
+    lat_by_edge: dict[int, float] = {}
+    for y in ys:
+        for edge in (y, y + 1):
+            if edge not in lat_by_edge:
+                lat_by_edge[edge] = _tile_y_to_lat(edge, n)
+    to_lon = _tile_x_to_lon
+    return [
+        (to_lon(x, n), lat_by_edge[y + 1], to_lon(x + 1, n), lat_by_edge[y])
+        for x, y in zip(xs, ys)
+    ]
 
 
 def tile_center_latlon(x: int, y: int, z: int) -> tuple[float, float]:
@@ -91,7 +165,7 @@ async def _fetch_with_retry(
         source: "mapbox" or "google" for error reporting
         max_retries: Maximum number of attempts
         timeout: Per-request timeout in seconds
-        backoff_base: Base for exponential backoff
+        backoff_base: Minimum backoff sleep (decorrelated jitter, capped at 30s)
 
     Returns:
         Response bytes on success
@@ -99,10 +173,9 @@ async def _fetch_with_retry(
     Raises:
         ImageryFetchError: On failure after all retries
     """
-    import asyncio
-
     last_status: int | None = None
     last_message: str = ""
+    backoff = backoff_base
 
     for attempt in range(1, max_retries + 1):
         try:
@@ -113,14 +186,21 @@ async def _fetch_with_retry(
                     return await response.read()
 
                 last_status = response.status
-                last_message = await response.text()
 
-                if response.status not in _RETRYABLE_STATUS:
+                if not (_RETRYABLE_STATUS_BITS >> response.status) & 1:
                     # Non-retryable error (4xx except 429)
                     raise ImageryFetchError(
-                        source, response.status, last_message, attempt
+                        source, response.status, await response.text(), attempt
                     )
 
+                # Only the final attempt's body ends up in the error, and only
+                # its head is needed; earlier retry bodies are never read
+                if attempt == max_retries:
+                    head = await response.content.read(_ERROR_BODY_PREVIEW_BYTES)
+                    last_message = head.decode("utf-8", errors="replace")
+                else:
+                    last_message = ""
+
                 # Retryable error - log and continue
                 _logger.warning(
                     "%s fetch attempt %d/%d failed with status %d",
@@ -146,8 +226,8 @@ async def _fetch_with_retry(
 
         # Don't sleep after the last attempt
         if attempt < max_retries:
-            sleep_for = backoff_base * (2 ** (attempt - 1))
-            await asyncio.sleep(sleep_for)
+            backoff = decorrelated_backoff(backoff, base=backoff_base)
+            await asyncio.sleep(backoff)
 
     raise ImageryFetchError(source, last_status, last_message, max_retries)
 
@@ -168,7 +248,7 @@ async def fetch_mapbox_tile(
     Args:
         z, x, y: Tile coordinates
         secrets_id: Secrets Manager secret ID containing MAPBOX_TOKEN
-        session: Optional aiohttp session (created if not provided)
+        session: Optional aiohttp session (shared module session if not provided)
         max_retries: Maximum retry attempts
         timeout: Per-request timeout in seconds
 
@@ -185,22 +265,16 @@ async def fetch_mapbox_tile(
 
     url = _mapbox_url(z, x, y, token)
 
-    close_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
-
-    try:
-        return await _fetch_with_retry(
-            session,
-            url,
-            source="mapbox",
-            max_retries=max_retries,
-            timeout=timeout,
-        )
-    finally:
-        if close_session:
-            await session.close()
+        session = await _get_session()
+
+    return await _fetch_with_retry(
+        session,
+        url,
+        source="mapbox",
+        max_retries=max_retries,
+        timeout=timeout,
+    )
 
 
 async def fetch_google_tile(
@@ -220,7 +294,7 @@ async def fetch_google_tile(
         lat, lon: Coordinates
         zoom: Zoom level
         secrets_id: Secrets Manager secret ID containing GOOGLE_MAPS_API_KEY
-        session: Optional aiohttp session (created if not provided)
+        session: Optional aiohttp session (shared module session if not provided)
         max_retries: Maximum retry attempts
         timeout: Per-request timeout in seconds
 
@@ -237,28 +311,68 @@ async def fetch_google_tile(
 
     url = _google_url(lat, lon, zoom, api_key)
 
-    close_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
-
-    try:
-        return await _fetch_with_retry(
-            session,
-            url,
-            source="google",
-            max_retries=max_retries,
-            timeout=timeout,
-        )
-    finally:
-        if close_session:
-            await session.close()
+        session = await _get_session()
+
+    return await _fetch_with_retry(
+        session,
+        url,
+        source="google",
+        max_retries=max_retries,
+        timeout=timeout,
+    )
+
+
+async def fetch_tiles_batch(
+    coords: Sequence[tuple],
+    *,
+    source: Literal["mapbox", "google"],
+    secrets_id: str,
+    session: aiohttp.ClientSession | None = None,
+    max_concurrency: int = 8,
+    max_retries: int = 3,
+    timeout: float = 10.0,
+) -> list[bytes | BaseException]:
+    """
+    Fetch many tiles from one source with bounded concurrency.
+
+    Args:
+        coords: (z, x, y) tuples for Mapbox, or (lat, lon, zoom) for Google
+        source: "mapbox" or "google"
+        secrets_id: Secrets Manager secret ID holding the source's token/key
+        session: Optional aiohttp session (shared module session if not provided)
+        max_concurrency: Maximum fetches in flight at once
+        max_retries: Maximum retry attempts per tile
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Image bytes per coordinate, in input order; a tile that failed holds
+        its exception instead, so one bad tile doesn't discard the batch.
+    """
+    if session is None:
+        session = await _get_session()
+    fetch = fetch_mapbox_tile if source == "mapbox" else fetch_google_tile
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one(coord: tuple) -> bytes:
+        async with semaphore:
+            return await fetch(
+                *coord,
+                secrets_id=secrets_id,
+                session=session,
+                max_retries=max_retries,
+                timeout=timeout,
+            )
+
+    return await asyncio.gather(*(fetch_one(coord) for coord in coords), return_exceptions=True)
 
 
 __all__ = [
     "ImageryFetchError",
     "fetch_mapbox_tile",
     "fetch_google_tile",
+    "fetch_tiles_batch",
     "tile_center_latlon",
     "tile_to_lonlat_bounds",
+    "tile_to_lonlat_bounds_batch",
 ]
@@ -1,5 +1,13 @@
 from .http import DeadlineExceededError, RetryExhaustedError, request_with_retry
-from .s3 import download_image, s3_url, upload_tile_image
+from . import tile_cache
+from .s3 import (
+    download_image,
+    s3_url,
+    tile_exists,
+    upload_tile_image,
+    upload_tile_images,
+    warm_s3_client,
+)
 from .s3_keys import google_coord_key, mapbox_tile_key
 
 __all__ = [
@@ -8,7 +16,11 @@ __all__ = [
     "request_with_retry",
     "download_image",
     "s3_url",
+    "tile_exists",
     "upload_tile_image",
+    "upload_tile_images",
+    "warm_s3_client",
     "google_coord_key",
     "mapbox_tile_key",
+    "tile_cache",
 ]
@@ -1,21 +1,69 @@
 from __future__ import annotations
 
+import asyncio
+import random
 import time
 from typing import Iterable
 
-try:  # pragma: no cover - requests may be packaged with the lambda
-    import requests
-except Exception as exc:  # pragma: no cover - local dev without requests
-    raise RuntimeError("requests is required for HTTP calls in Lambda") from exc
+try:  # pragma: no cover - httpx may be packaged with the lambda
+    import httpx
+except Exception as exc:  # pragma: no cover - local dev without httpx
+    raise RuntimeError("httpx is required for HTTP calls in Lambda") from exc
 
-_SESSION = requests.Session()
 _RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
 
 
+def status_bitmap(statuses: Iterable[int]) -> int:
+    """
+    Pack HTTP status codes into an int bitmap; test with `(bitmap >> status) & 1`.
+
+    A shift-and-mask is cheaper than hashing the status into a set on every response.
+    """
+    bitmap = 0
+    for status in statuses:
+        bitmap |= 1 << status
+    return bitmap
+
+
+_RETRYABLE_STATUS_BITS = status_bitmap(_RETRYABLE_STATUS)
+_BACKOFF_CAP_SECONDS = 30.0
+
+# Seeded once per process from OS entropy, so concurrent environments don't
+# retry in lockstep
+_rng = random.Random()
+
+
+def decorrelated_backoff(
+    previous: float,
+    *,
+    base: float,
+    cap: float = _BACKOFF_CAP_SECONDS,
+) -> float:
+    """Next sleep under AWS "decorrelated jitter": uniform(base, previous * 3), capped."""
+    return min(cap, _rng.uniform(base, previous * 3))
+
+
+# Pooled client reused across calls; its connections belong to the loop that
+# created it, so it is rebuilt if the running loop changes.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=64)
+        )
+        _client_loop = loop
+    return _client
+
+
 class RetryExhaustedError(Exception):
     """Raised when all retry attempts have been exhausted."""
 
-    def __init__(self, response: requests.Response, attempts: int) -> None:
+    def __init__(self, response: httpx.Response, attempts: int) -> None:
         self.response = response
         self.attempts = attempts
         super().__init__(
@@ -34,7 +82,7 @@ class DeadlineExceededError(Exception):
         )
 
 
-def request_with_retry(
+async def request_with_retry(
     method: str,
     url: str,
     *,
@@ -45,7 +93,7 @@ def request_with_retry(
     deadline_epoch: float | None = None,
     min_time_for_attempt_ms: float = 5000.0,
     **kwargs: object,
-) -> requests.Response:
+) -> httpx.Response:
     """
     Make an HTTP request with exponential backoff retry.
 
@@ -54,35 +102,47 @@ def request_with_retry(
         url: Target URL
         timeout: Per-request timeout in seconds
         max_retries: Maximum number of attempts
-        backoff_base: Base for exponential backoff (default 0.5s)
+        backoff_base: Minimum backoff sleep; delays grow with decorrelated
+            jitter from there, capped at 30s (default 0.5s)
         retryable_status: Set of HTTP status codes that trigger retry
         deadline_epoch: Absolute Unix timestamp deadline. If set, will raise
             DeadlineExceededError if there isn't enough time for another attempt.
         min_time_for_attempt_ms: Minimum milliseconds needed to start an attempt
             (used with deadline_epoch). Default 5000ms.
-        **kwargs: Passed to requests.Session.request()
+        **kwargs: Passed to httpx.AsyncClient.request()
 
     Returns:
-        requests.Response on success (non-retryable status)
+        httpx.Response on success (non-retryable status)
 
     Raises:
         RetryExhaustedError: All retries exhausted with retryable status
         DeadlineExceededError: Not enough time remaining before deadline
-        requests.RequestException: Network-level errors (not retried)
+        httpx.HTTPError: Network-level errors (not retried)
     """
-    retryable = frozenset(retryable_status)
-    last_response: requests.Response | None = None
+    retryable = (
+        _RETRYABLE_STATUS_BITS
+        if retryable_status is _RETRYABLE_STATUS
+        else status_bitmap(retryable_status)
+    )
+    last_response: httpx.Response | None = None
+    backoff = backoff_base
+    client = _get_client()
+    # Convert the absolute deadline once; interval math below uses the monotonic
+    # clock so wall-clock adjustments can't shorten or stretch the budget
+    deadline_mono = (
+        None if deadline_epoch is None else time.monotonic() + (deadline_epoch - time.time())
+    )
 
     for attempt in range(1, max_retries + 1):
         # Check deadline before starting attempt
-        if deadline_epoch is not None:
-            remaining_ms = (deadline_epoch - time.time()) * 1000
+        if deadline_mono is not None:
+            remaining_ms = (deadline_mono - time.monotonic()) * 1000
             if remaining_ms < min_time_for_attempt_ms:
                 raise DeadlineExceededError(remaining_ms)
 
-        response = _SESSION.request(method, url, timeout=timeout, **kwargs)
+        response = await client.request(method, url, timeout=timeout, **kwargs)
 
-        if response.status_code not in retryable:
+        if not (retryable >> response.status_code) & 1:
             return response
 
         # Extract retry-after before closing
@@ -90,7 +150,7 @@ def request_with_retry(
 
         # Close the response to release the connection back to the pool
         # This prevents connection leaks in warm Lambda environments
-        response.close()
+        await response.aclose()
 
         last_response = response
 
@@ -98,24 +158,22 @@ def request_with_retry(
         if attempt >= max_retries:
             break
 
-        # Exponential backoff: 0.5, 1.0, 2.0, 4.0, ...
+        # Jittered exponential backoff, unless the server said how long to wait
+        backoff = decorrelated_backoff(backoff, base=backoff_base)
+        sleep_for = backoff
         if retry_after:
             try:
                 sleep_for = float(retry_after)
             except ValueError:
-                sleep_for = backoff_base * (2 ** (attempt - 1))
-        else:
-            sleep_for = backoff_base * (2 ** (attempt - 1))
+                pass
 
         # Check if sleeping would exceed deadline
-        if deadline_epoch is not None:
-            time_after_sleep = time.time() + sleep_for
-            if time_after_sleep + (min_time_for_attempt_ms / 1000) > deadline_epoch:
-                raise DeadlineExceededError(
-                    (deadline_epoch - time.time()) * 1000
-                )
+        if deadline_mono is not None:
+            now = time.monotonic()
+            if now + sleep_for + (min_time_for_attempt_ms / 1000) > deadline_mono:
+                raise DeadlineExceededError((deadline_mono - now) * 1000)
 
-        time.sleep(sleep_for)
+        await asyncio.sleep(sleep_for)
 
     # All retries exhausted with retryable status
     assert last_response is not None
@@ -123,6 +181,8 @@ def request_with_retry(
 
 
 __all__ = [
+    "decorrelated_backoff",
+    "status_bitmap",
     "request_with_retry",
     "RetryExhaustedError",
     "DeadlineExceededError",
@@ -1,24 +1,97 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
-from typing import Literal
+from contextlib import AsyncExitStack
+from typing import Any, Literal, Sequence
 
 import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
 
 from .s3_keys import google_coord_key, mapbox_tile_key
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - non-image payloads are then stored uncompressed
+    zstandard = None
+
 _logger = logging.getLogger(__name__)
 
-# Module-level session for connection reuse across warm Lambda invocations
-_session: aioboto3.Session | None = None
+# JPEG/PNG are already compressed; anything else is zstd-encoded on upload
+_IMAGE_MAGICS = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+_ZSTD_LEVEL = 3
+
+
+def _maybe_compress(payload: bytes) -> tuple[bytes, str | None]:
+    """Return (body, ContentEncoding) for an upload."""
+    if zstandard is None or payload.startswith(_IMAGE_MAGICS):
+        return payload, None
+    return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(payload), "zstd"
+
+
+# Module-level session for connection reuse across warm Lambda invocations.
+# Creating it is cheap and side-effect free, so it's built at import time.
+_session = aioboto3.Session()
+
+# Sized for a full SQS batch of concurrent tiles, each doing a GET or PUT; the
+# default of 10 pooled connections would queue them.
+_S3_CLIENT_CONFIG = AioConfig(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+)
+
+# Long-lived S3 client, entered once and reused instead of an `async with` per call.
+# Like any aiohttp-backed client it belongs to the loop that created it.
+_s3_client: Any = None
+_s3_client_loop: asyncio.AbstractEventLoop | None = None
+_s3_client_stack: AsyncExitStack | None = None
+# Serializes creation, so a batch's concurrent first calls share one client;
+# asyncio locks are loop-bound too, so it is replaced along with the loop
+_s3_client_lock: asyncio.Lock | None = None
+_s3_client_lock_loop: asyncio.AbstractEventLoop | None = None
+
 
+async def _get_s3_client() -> Any:
+    """Get or create the shared S3 client for the running event loop."""
+    global _s3_client, _s3_client_loop, _s3_client_stack, _s3_client_lock, _s3_client_lock_loop
+    loop = asyncio.get_running_loop()
+    if _s3_client is not None and _s3_client_loop is loop:
+        return _s3_client
 
-def _get_session() -> aioboto3.Session:
-    """Get or create the aioboto3 session (singleton per Lambda environment)."""
-    global _session
-    if _session is None:
-        _session = aioboto3.Session()
-    return _session
+    if _s3_client_lock is None or _s3_client_lock_loop is not loop:
+        _s3_client_lock = asyncio.Lock()
+        _s3_client_lock_loop = loop
+    async with _s3_client_lock:
+        if _s3_client is not None and _s3_client_loop is loop:
+            return _s3_client
+
+        if _s3_client_stack is not None:
+            # A client left over from an earlier loop; release its connector
+            # rather than leaking it when the globals are overwritten
+            old_stack, _s3_client, _s3_client_stack = _s3_client_stack, None, None
+            try:
+                await old_stack.aclose()
+            except Exception as exc:
+                _logger.debug("Closing stale S3 client failed: %s", exc)
+
+        stack = AsyncExitStack()
+        _s3_client = await stack.enter_async_context(_session.client("s3", config=_S3_CLIENT_CONFIG))
+        _s3_client_loop = loop
+        _s3_client_stack = stack
+    return _s3_client
+
+
+@atexit.register
+def _close_s3_client() -> None:
+    """Exit the shared client on interpreter shutdown if its loop is still usable."""
+    if _s3_client_stack is None or _s3_client_loop is None:
+        return
+    if _s3_client_loop.is_closed() or _s3_client_loop.is_running():
+        return
+    _s3_client_loop.run_until_complete(_s3_client_stack.aclose())
 
 
 async def upload_tile_image(
@@ -37,6 +110,7 @@ async def upload_tile_image(
     zoom: int | None = None,
     # Options
     content_type: str | None = None,
+    client: Any = None,
 ) -> tuple[str, str]:
     """
     Upload tile imagery to S3 with deterministic key.
@@ -49,6 +123,7 @@ async def upload_tile_image(
         z, x, y: Mapbox tile coordinates (required if imagery_source="mapbox")
         lat, lon, zoom: Google coordinates (required if imagery_source="google")
         content_type: Optional content type (auto-detected if not provided)
+        client: Optional S3 client to use instead of the shared one
 
     Returns:
         Tuple of (bucket, key) for the uploaded object
@@ -71,30 +146,104 @@ async def upload_tile_image(
 
     _logger.info("Uploading to s3://%s/%s", bucket, key)
 
-    session = _get_session()
-    async with session.client("s3") as client:
-        await client.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=image_bytes,
-            ContentType=content_type,
-        )
+    body, content_encoding = _maybe_compress(image_bytes)
+    params: dict[str, Any] = {}
+    if content_encoding is not None:
+        params["ContentEncoding"] = content_encoding
+
+    if client is None:
+        client = await _get_s3_client()
+    await client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body,
+        ContentType=content_type,
+        **params,
+    )
 
     return bucket, key
 
 
-async def download_image(bucket: str, key: str) -> bytes:
+async def upload_tile_images(
+    batch: Sequence[tuple[bytes, dict[str, Any]]],
+) -> list[tuple[str, str]]:
+    """
+    Upload several tiles concurrently over the shared client.
+
+    Args:
+        batch: (image_bytes, kwargs) pairs, where kwargs are the keyword
+            arguments of `upload_tile_image` for that tile
+
+    Returns:
+        (bucket, key) for each upload, in batch order
+    """
+    return list(
+        await asyncio.gather(
+            *(upload_tile_image(image_bytes, **kwargs) for image_bytes, kwargs in batch)
+        )
+    )
+
+
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def download_image(bucket: str, key: str, *, client: Any = None) -> bytes | bytearray:
     """
     Download image from S3.
 
     Used on retry when S3 checkpoint exists — avoids re-fetching from imagery API.
+    The body is streamed into one buffer preallocated from ContentLength and
+    returned as-is (a bytes-like bytearray) to avoid a final copy; objects
+    written with ContentEncoding=zstd are decompressed first. Pass `client` to
+    use a specific S3 client instead of the shared one.
     """
     _logger.info("Downloading from s3://%s/%s", bucket, key)
 
-    session = _get_session()
-    async with session.client("s3") as client:
-        response = await client.get_object(Bucket=bucket, Key=key)
-        return await response["Body"].read()
+    if client is None:
+        client = await _get_s3_client()
+    response = await client.get_object(Bucket=bucket, Key=key)
+    size = int(response.get("ContentLength") or 0)
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    async with response["Body"] as stream:
+        async for chunk in stream.iter_chunks(_DOWNLOAD_CHUNK_SIZE):
+            end = offset + len(chunk)
+            if end > size:
+                # ContentLength was missing or short; fall back to growing the buffer
+                view.release()
+                buf[offset:] = chunk
+                view = memoryview(buf)
+            else:
+                view[offset:end] = chunk
+            offset = end
+    view.release()
+    if offset < size:
+        del buf[offset:]
+
+    if response.get("ContentEncoding") == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read zstd-encoded s3://{bucket}/{key}")
+        return zstandard.ZstdDecompressor().decompress(buf)
+    return buf
+
+
+async def tile_exists(bucket: str, key: str) -> bool:
+    """Check whether an object exists with a HEAD request, without transferring its body."""
+    client = await _get_s3_client()
+    try:
+        await client.head_object(Bucket=bucket, Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    return True
+
+
+async def warm_s3_client(bucket: str) -> None:
+    """Open the shared client's first connection with a HEAD on the bucket."""
+    client = await _get_s3_client()
+    await client.head_bucket(Bucket=bucket)
 
 
 def s3_url(bucket: str, key: str, region: str = "us-east-1") -> str:
@@ -102,4 +251,11 @@ def s3_url(bucket: str, key: str, region: str = "us-east-1") -> str:
     return f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
 
 
-__all__ = ["upload_tile_image", "download_image", "s3_url"]
+__all__ = [
+    "upload_tile_image",
+    "upload_tile_images",
+    "download_image",
+    "tile_exists",
+    "warm_s3_client",
+    "s3_url",
+]
@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import functools
+
 from ..schema import COORD_TILE_ID_PRECISION, DEFAULT_GOOGLE_ZOOM
 
+_COORD_FMT = "%%.%df" % COORD_TILE_ID_PRECISION
+
+
+@functools.lru_cache(maxsize=8)
+def _coord_key_template(run_id: str, zoom: int | None, ext: str) -> str:
+    """
+    %-template for one run's coordinate keys with everything but lat/lon filled in.
+
+    A run uses a single zoom and extension, so each key is then one two-field
+    format with the zoom default and precision already resolved.
+    """
+    z = zoom if zoom is not None else DEFAULT_GOOGLE_ZOOM
+    prefix = f"runs/{run_id}/coords/".replace("%", "%%")
+    return f"{prefix}lat={_COORD_FMT}/lon={_COORD_FMT}/z={z}.{ext.replace('%', '%%')}"
+
 
 def mapbox_tile_key(run_id: str, z: int, x: int, y: int, ext: str = "png") -> str:
     return f"runs/{run_id}/tiles/z={z}/x={x}/y={y}.{ext}"
@@ -14,10 +31,7 @@ def google_coord_key(
     zoom: int | None = None,
     ext: str = "png",
 ) -> str:
-    z = zoom if zoom is not None else DEFAULT_GOOGLE_ZOOM
-    lat_str = f"{lat:.{COORD_TILE_ID_PRECISION}f}"
-    lon_str = f"{lon:.{COORD_TILE_ID_PRECISION}f}"
-    return f"runs/{run_id}/coords/lat={lat_str}/lon={lon_str}/z={z}.{ext}"
+    return _coord_key_template(run_id, zoom, ext) % (lat, lon)
 
 
 __all__ = ["mapbox_tile_key", "google_coord_key"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+# Lambda gives each environment 512 MB of /tmp by default; keep the cache at half
+CACHE_DIR = Path("/tmp/tile-cache")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Total size of CACHE_DIR, scanned lazily on first write and tracked from then on
+_total_bytes: int | None = None
+# Callers run put() in worker threads; the size accounting and eviction are shared
+_write_lock = threading.Lock()
+
+
+def _path_for(bucket: str, key: str) -> Path:
+    digest = hashlib.sha1(f"{bucket}/{key}".encode("utf-8"), usedforsecurity=False).hexdigest()
+    return CACHE_DIR / f"{digest}.bin"
+
+
+def get(bucket: str, key: str) -> bytes | None:
+    """Return cached bytes for an S3 object, or None on a miss."""
+    path = _path_for(bucket, key)
+    try:
+        data = path.read_bytes()
+        # mtime doubles as the LRU clock
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        _logger.warning("Tile cache read failed for %s: %s", path, exc)
+        return None
+    return data
+
+
+def put(bucket: str, key: str, data: bytes | bytearray) -> None:
+    """Cache bytes for an S3 object, evicting least recently used files past the size cap."""
+    if len(data) > MAX_CACHE_BYTES:
+        return
+    path = _path_for(bucket, key)
+    with _write_lock:
+        _put_locked(path, data)
+
+
+def _put_locked(path: Path, data: bytes | bytearray) -> None:
+    global _total_bytes
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if _total_bytes is None:
+            _total_bytes = sum(entry.stat().st_size for entry in os.scandir(CACHE_DIR))
+        try:
+            _total_bytes -= path.stat().st_size
+        except FileNotFoundError:
+            pass
+
+        # Write then rename, so a concurrent reader never sees a partial file
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        _total_bytes += len(data)
+
+        if _total_bytes > MAX_CACHE_BYTES:
+            _evict(keep=path)
+    except OSError as exc:
+        _logger.warning("Tile cache write failed for %s: %s", path, exc)
+        _total_bytes = None  # rescan on the next write
+
+
+def _evict(*, keep: Path) -> None:
+    global _total_bytes
+    entries = sorted(
+        (entry for entry in os.scandir(CACHE_DIR) if entry.path != str(keep)),
+        key=lambda entry: entry.stat().st_mtime_ns,
+    )
+    for entry in entries:
+        if _total_bytes <= MAX_CACHE_BYTES:
+            break
+        size = entry.stat().st_size
+        os.remove(entry.path)
+        _total_bytes -= size
+
+
+__all__ = ["get", "put", "CACHE_DIR", "MAX_CACHE_BYTES"]
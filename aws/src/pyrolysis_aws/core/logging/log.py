@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
-from contextlib import contextmanager
-from typing import Any, Iterator
+from types import TracebackType
+from typing import Any, Literal, Mapping
+
+import orjson
 
 _logger = logging.getLogger(__name__)
 
@@ -42,6 +43,10 @@ def log_structured(
         error_code: Error code if applicable
         **extra: Additional fields to include
     """
+    # Skip building and serializing the payload when the record would be dropped
+    if not logger.isEnabledFor(level):
+        return
+
     data: dict[str, Any] = {"msg": message}
 
     if run_id is not None:
@@ -59,81 +64,101 @@ def log_structured(
 
     data.update(extra)
 
-    logger.log(level, json.dumps(data, default=str))
+    logger.log(level, orjson.dumps(data, default=str).decode())
+
+
+class _Span:
+    """Timed stage context manager; a plain class avoids the generator machinery."""
+
+    __slots__ = ("logger", "stage", "context", "extra", "start_ns")
+
+    def __init__(self, logger: logging.Logger, stage: str, context: dict[str, Any]) -> None:
+        self.logger = logger
+        self.stage = stage
+        self.context = context
+        self.extra: dict[str, Any] = {}
+        self.start_ns = 0
+
+    def __enter__(self) -> dict[str, Any]:
+        self.start_ns = time.perf_counter_ns()
+        return self.extra
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> Literal[False]:
+        dur_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        if exc is None:
+            log_structured(
+                self.logger,
+                logging.INFO,
+                f"Completed {self.stage}",
+                stage=self.stage,
+                dur_ms=dur_ms,
+                **self.context,
+                **self.extra,
+            )
+        elif isinstance(exc, Exception):
+            log_structured(
+                self.logger,
+                logging.ERROR,
+                f"Failed {self.stage}: {exc}",
+                stage=self.stage,
+                dur_ms=dur_ms,
+                error=str(exc),
+                **self.context,
+                **self.extra,
+            )
+        # Never swallow the exception
+        return False
 
 
-@contextmanager
 def timed_stage(
     logger: logging.Logger,
     stage: str,
+    log_ctx: Mapping[str, Any] | None = None,
     *,
     run_id: str | None = None,
     tile_id: str | None = None,
     attempt: int | None = None,
     log_start: bool = False,
-) -> Iterator[dict[str, Any]]:
+) -> _Span:
     """
     Context manager for timing a processing stage.
 
     Usage:
-        with timed_stage(logger, "fetch_imagery", run_id=rid, tile_id=tid) as ctx:
+        with timed_stage(logger, "fetch_imagery", log_ctx) as ctx:
             # do work
             ctx["bytes"] = 12345  # add extra fields to completion log
 
     Args:
         logger: Logger instance
         stage: Stage name for logging
-        run_id: Run identifier
-        tile_id: Tile identifier
-        attempt: Attempt number
+        log_ctx: Context fields (run_id, tile_id, attempt) passed through to every log
+        run_id: Run identifier, overriding log_ctx
+        tile_id: Tile identifier, overriding log_ctx
+        attempt: Attempt number, overriding log_ctx
         log_start: If True, log at INFO when entering the stage
 
-    Yields:
-        dict that can be modified to add extra fields to the completion log
+    Returns:
+        Context manager yielding a dict that can be modified to add extra
+        fields to the completion log
     """
-    extra: dict[str, Any] = {}
-    start = time.perf_counter()
+    # Resolve the context once; every log of the span reuses it
+    context: dict[str, Any] = dict(log_ctx) if log_ctx else {}
+    if run_id is not None:
+        context["run_id"] = run_id
+    if tile_id is not None:
+        context["tile_id"] = tile_id
+    if attempt is not None:
+        context["attempt"] = attempt
 
     if log_start:
-        log_structured(
-            logger,
-            logging.INFO,
-            f"Starting {stage}",
-            run_id=run_id,
-            tile_id=tile_id,
-            attempt=attempt,
-            stage=stage,
-        )
-
-    try:
-        yield extra
-        dur_ms = (time.perf_counter() - start) * 1000
-        log_structured(
-            logger,
-            logging.INFO,
-            f"Completed {stage}",
-            run_id=run_id,
-            tile_id=tile_id,
-            attempt=attempt,
-            stage=stage,
-            dur_ms=dur_ms,
-            **extra,
-        )
-    except Exception as exc:
-        dur_ms = (time.perf_counter() - start) * 1000
-        log_structured(
-            logger,
-            logging.ERROR,
-            f"Failed {stage}: {exc}",
-            run_id=run_id,
-            tile_id=tile_id,
-            attempt=attempt,
-            stage=stage,
-            dur_ms=dur_ms,
-            error=str(exc),
-            **extra,
-        )
-        raise
+        log_structured(logger, logging.INFO, f"Starting {stage}", stage=stage, **context)
+
+    return _Span(logger, stage, context)
 
 
 __all__ = ["get_logger", "log_structured", "timed_stage"]
@@ -1,3 +1,3 @@
-from .client import AnalysisError, AnalysisStatus, AgentOutput, analyze_image
+from .client import AnalysisError, AnalysisStatus, AgentOutput, analyze_image, warm_http_client
 
-__all__ = ["AnalysisError", "AnalysisStatus", "AgentOutput", "analyze_image"]
+__all__ = ["AnalysisError", "AnalysisStatus", "AgentOutput", "analyze_image", "warm_http_client"]
@@ -1,20 +1,51 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from dataclasses import asdict
 from enum import Enum
 
+import httpx
+import openai
 from pydantic import BaseModel, Field, ValidationError
 from pydantic_ai import Agent, BinaryContent
-from pydantic_ai.exceptions import UnexpectedModelBehavior
+from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
 from pydantic_ai.models.openai import OpenAIResponsesModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
 from ..aws_clients.secrets import get_secret_json
 
+try:
+    from pydantic_ai.exceptions import ModelAPIError
+except ImportError:  # pragma: no cover - older pydantic-ai lets transport errors through
+    ModelAPIError = openai.APIConnectionError
+
 _logger = logging.getLogger(__name__)
 
 MODEL_NAME = "gpt-5-mini"
+_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+# One connection pool to the OpenAI API for every agent in this environment
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(120.0, connect=5.0),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def warm_http_client() -> None:
+    """Open a pooled connection to the OpenAI API; any HTTP status will do."""
+    response = await _get_http_client().head(_OPENAI_BASE_URL)
+    await response.aclose()
 
 
 class AnalysisStatus(str, Enum):
@@ -33,25 +64,42 @@ class AgentOutput(BaseModel):
 
 
 class AnalysisError(Exception):
-    """Raised when image analysis fails."""
+    """
+    Raised when image analysis fails.
 
-    def __init__(self, message: str, cause: Exception | None = None) -> None:
+    status_code is the OpenAI HTTP status when the API rejected the request;
+    retryable marks failures (429, 5xx, connection errors) worth an inline retry.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        cause: Exception | None = None,
+        *,
+        status_code: int | None = None,
+        retryable: bool = False,
+    ) -> None:
         self.cause = cause
+        self.status_code = status_code
+        self.retryable = retryable
         super().__init__(message)
 
 
-def _make_agent(api_key: str) -> Agent[None, AgentOutput]:
+@functools.lru_cache(maxsize=4)
+def _make_agent(api_key: str, http_client: httpx.AsyncClient) -> Agent[None, AgentOutput]:
     """
     Build a PydanticAI Agent for pyrolysis detection.
 
-    Uses OpenAI Responses API with structured output validation.
+    Uses OpenAI Responses API with structured output validation. Cached per
+    API key and HTTP client so warm invocations reuse the agent; a rotated key,
+    or a client rebuilt for a new event loop, simply builds a new entry.
     """
     model_settings = {"openai_reasoning_effort": "low"}
 
     model = OpenAIResponsesModel(
         model_name=MODEL_NAME,
         settings=model_settings,
-        provider=OpenAIProvider(api_key=api_key),
+        provider=OpenAIProvider(api_key=api_key, http_client=http_client),
     )
 
     instructions = """
@@ -79,11 +127,22 @@ def _make_agent(api_key: str) -> Agent[None, AgentOutput]:
     )
 
 
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+
+def _sniff_media_type(image_bytes: bytes | bytearray) -> str:
+    """Mapbox tiles are JPEG, Google Static images PNG; tell them apart by magic bytes."""
+    if image_bytes[:3] == _JPEG_MAGIC:
+        return "image/jpeg"
+    return "image/png"
+
+
 async def analyze_image(
-    image_bytes: bytes,
+    image_bytes: bytes | bytearray,
     *,
     secrets_id: str,
     agent: Agent[None, AgentOutput] | None = None,
+    media_type: str | None = None,
 ) -> tuple[AgentOutput, dict]:
     """
     Analyze satellite imagery for pyrolysis activity.
@@ -91,33 +150,42 @@ async def analyze_image(
     Args:
         image_bytes: Image data (PNG or JPEG)
         secrets_id: Secrets Manager secret ID containing OPENAI_API_KEY
-        agent: Optional pre-configured agent (for reuse across calls)
+        agent: Optional pre-configured agent (defaults to the cached agent for the key)
+        media_type: Image MIME type; sniffed from the leading bytes if not given
 
     Returns:
         Tuple of (AgentOutput, usage_dict) where usage_dict contains
         token usage and model info.
 
     Raises:
-        AnalysisError: On validation failure or LLM invocation error
+        AnalysisError: On validation failure, LLM invocation error, or API error
     """
     if agent is None:
         secrets = get_secret_json(secrets_id)
         api_key = secrets.get("OPENAI_API_KEY", "").strip()
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY not found in secrets")
-        agent = _make_agent(api_key)
+        agent = _make_agent(api_key, _get_http_client())
 
     try:
         run = await agent.run(
             [
                 "Decide if this image shows tyre pyrolysis activity:",
-                BinaryContent(image_bytes, media_type="image/png"),
+                BinaryContent(image_bytes, media_type=media_type or _sniff_media_type(image_bytes)),
             ]
         )
 
         output: AgentOutput = run.output
-        usage_dict = asdict(run.usage())
-        usage_dict["model"] = MODEL_NAME
+        usage = run.usage()
+        usage_dict = {
+            "requests": usage.requests,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_read_tokens": usage.cache_read_tokens,
+            "total_tokens": usage.total_tokens,
+            "details": dict(usage.details),
+            "model": MODEL_NAME,
+        }
 
         return output, usage_dict
 
@@ -129,10 +197,24 @@ async def analyze_image(
         _logger.exception("LLM call failed: %s", exc)
         raise AnalysisError("LLM invocation failed", exc) from exc
 
+    except ModelHTTPError as exc:
+        _logger.warning("OpenAI returned HTTP %s: %s", exc.status_code, exc)
+        raise AnalysisError(
+            f"OpenAI returned HTTP {exc.status_code}",
+            exc,
+            status_code=exc.status_code,
+            retryable=exc.status_code == 429 or exc.status_code >= 500,
+        ) from exc
+
+    except (ModelAPIError, openai.APIConnectionError) as exc:
+        _logger.warning("OpenAI request failed: %s", exc)
+        raise AnalysisError("OpenAI request failed", exc, retryable=True) from exc
+
 
 __all__ = [
     "AnalysisStatus",
     "AgentOutput",
     "AnalysisError",
     "analyze_image",
+    "warm_http_client",
 ]
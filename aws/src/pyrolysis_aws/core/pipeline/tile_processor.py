@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import time
+from typing import Any, Callable
 
 from ..config import WorkerConfig
 from ..ddb.runs import update_run_counters
@@ -8,7 +12,9 @@ from ..ddb.tilejobs import checkpoint_s3, claim_job, complete_job, fail_job
 from ..errors import ErrorCode, error_code_from_http_status
 from ..imagery import ImageryFetchError, fetch_google_tile, fetch_mapbox_tile
 from ..logging import get_logger, log_structured, timed_stage
-from ..openai import AgentOutput, AnalysisError, analyze_image
+from ..openai import AgentOutput, AnalysisError, AnalysisStatus, analyze_image
+from ..io import tile_cache
+from ..io.http import decorrelated_backoff
 from ..io.s3 import download_image, upload_tile_image
 from ..schema import ClaimResult, ProcessTileResult, S3Checkpoint, TileJobMessage
 
@@ -18,6 +24,23 @@ _logger = get_logger(__name__)
 # With 120s timeout, we want at least 20s buffer
 MIN_REMAINING_MS_FOR_OPENAI = 20_000
 
+# Inline retries of transient OpenAI failures, on top of the SDK's own; anything
+# still failing goes back to SQS
+_OPENAI_RETRIES = 2
+_OPENAI_BACKOFF_BASE_SECONDS = 0.2
+
+
+def _prefilter(image_bytes: bytes | bytearray, config: WorkerConfig) -> AgentOutput | None:
+    """
+    Classify a tile without the vision model when it is trivially empty.
+
+    A JPEG/PNG's encoded size tracks its detail, so a tile that compresses below
+    config.prefilter_min_bytes is near-uniform and can't show a pyrolysis site.
+    """
+    if len(image_bytes) >= config.prefilter_min_bytes:
+        return None
+    return AgentOutput(status=AnalysisStatus.NO, reasoning="low-detail tile (prefiltered)")
+
 
 def _get_s3_checkpoint(checkpoint: S3Checkpoint | None) -> tuple[str, str] | None:
     """Extract S3 checkpoint if present."""
@@ -31,6 +54,8 @@ async def process_tile(
     config: WorkerConfig,
     *,
     remaining_time_ms: int | None = None,
+    fetch_semaphore: asyncio.Semaphore | None = None,
+    openai_semaphore: asyncio.Semaphore | None = None,
 ) -> ProcessTileResult:
     """
     Process a single tile job.
@@ -42,7 +67,12 @@ async def process_tile(
     Args:
         message: Parsed and validated TileJobMessage from SQS
         config: Worker configuration
-        remaining_time_ms: Lambda remaining time in ms (for time budgeting)
+        remaining_time_ms: Lambda remaining time in ms when the invocation started
+            (for time budgeting; converted to a monotonic deadline on entry)
+        fetch_semaphore: Optional limit shared by a batch's imagery fetch/upload
+            (or checkpoint download) stage
+        openai_semaphore: Optional limit shared by a batch's OpenAI stage; held
+            separately so tiles queued on it don't hold up other tiles' fetches
 
     Returns:
         dict with processing result info
@@ -50,15 +80,23 @@ async def process_tile(
     Raises:
         Exception: On failure (to trigger SQS retry)
     """
+    deadline = None
+    if remaining_time_ms is not None:
+        # Tiles of a batch run concurrently, so budget against the shared deadline
+        # rather than the remaining time observed before any work started
+        deadline = time.monotonic() + remaining_time_ms / 1000
+
     run_id = message.run_id
-    tile_id = message.get_tile_id()
+    tile_id = message.tile_id
     log_ctx = {"run_id": run_id, "tile_id": tile_id}
 
     log_structured(_logger, logging.INFO, "Processing tile", **log_ctx)
 
-    # Step 1: Claim the job (idempotent)
-    with timed_stage(_logger, "claim", run_id=run_id, tile_id=tile_id):
-        claim_result = claim_job(
+    # Step 1: Claim the job (idempotent). The DDB helpers are blocking boto3 calls,
+    # so they run in worker threads to keep the batch's other tiles moving
+    with timed_stage(_logger, "claim", log_ctx):
+        claim_result = await asyncio.to_thread(
+            claim_job,
             config.tilejobs_table,
             message,
             lock_seconds=config.job_stale_lock_seconds,
@@ -71,11 +109,7 @@ async def process_tile(
             "Job already completed, skipping",
             **log_ctx,
         )
-        return ProcessTileResult(
-            status="skipped",
-            tile_id=tile_id,
-            reason="already_completed",
-        )
+        return {"status": "skipped", "tile_id": tile_id, "reason": "already_completed"}
 
     if claim_result.result == ClaimResult.LOCKED_BY_OTHER:
         log_structured(
@@ -89,6 +123,7 @@ async def process_tile(
     attempt = claim_result.attempt or 1
     claimed_at_epoch = claim_result.claimed_at_epoch
     log_ctx["attempt"] = attempt
+    checkpoint_task: asyncio.Task | None = None
 
     try:
         # Step 2: Get image bytes (from checkpoint or fresh fetch)
@@ -102,93 +137,171 @@ async def process_tile(
                 "S3 checkpoint found, downloading instead of fetching",
                 **log_ctx,
             )
-            image_bytes = await _download_from_checkpoint(s3_bucket, s3_key, log_ctx)
+            async with fetch_semaphore or contextlib.nullcontext():
+                image_bytes = await _download_from_checkpoint(s3_bucket, s3_key, log_ctx)
         else:
-            image_bytes = await _fetch_imagery(message, config, log_ctx)
-            s3_bucket, s3_key = await _upload_to_s3(message, image_bytes, config, log_ctx)
-
-            # Checkpoint: record S3 location before OpenAI call
-            with timed_stage(_logger, "checkpoint_s3", **log_ctx):
-                checkpoint_s3(config.tilejobs_table, run_id, tile_id, s3_bucket=s3_bucket, s3_key=s3_key)
-
-        # Step 3: Check time budget before OpenAI call
-        if remaining_time_ms is not None and remaining_time_ms < MIN_REMAINING_MS_FOR_OPENAI:
-            raise TimeoutError(
-                f"Only {remaining_time_ms}ms remaining, aborting before OpenAI call"
+            async with fetch_semaphore or contextlib.nullcontext():
+                image_bytes = await _fetch_imagery(message, config, log_ctx)
+                s3_bucket, s3_key = await _upload_to_s3(message, image_bytes, config, log_ctx)
+
+            # Checkpoint: record S3 location while the OpenAI call runs. Only the
+            # key is needed, so the DDB write stays off the critical path
+            checkpoint_task = asyncio.create_task(
+                _record_checkpoint(config, run_id, tile_id, s3_bucket, s3_key, log_ctx)
             )
 
-        # Step 4: Analyze with OpenAI
-        agent_output, usage_dict = await _analyze_with_openai(image_bytes, config, log_ctx)
+        # Near-uniform tiles (open water, cloud) are answered without the model
+        agent_output = _prefilter(image_bytes, config)
+        usage_dict = None
+        if agent_output is not None:
+            log_structured(
+                _logger,
+                logging.INFO,
+                "Tile below prefilter size, skipping OpenAI",
+                bytes=len(image_bytes),
+                **log_ctx,
+            )
+        else:
+            async with openai_semaphore or contextlib.nullcontext():
+                # Step 3: Check time budget before OpenAI call (after any wait for a slot)
+                if deadline is not None:
+                    remaining_ms = (deadline - time.monotonic()) * 1000
+                    if remaining_ms < MIN_REMAINING_MS_FOR_OPENAI:
+                        raise TimeoutError(
+                            f"Only {remaining_ms:.0f}ms remaining, aborting before OpenAI call"
+                        )
+
+                # Step 4: Analyze with OpenAI
+                agent_output, usage_dict = await _analyze_with_openai(
+                    image_bytes, config, log_ctx, deadline
+                )
+        status_value = agent_output.status.value
+
+        # Let the checkpoint land before completing, so the write isn't left
+        # in flight when the invocation returns and the environment freezes
+        if checkpoint_task is not None:
+            await checkpoint_task
 
         # Step 5: Complete the job
-        with timed_stage(_logger, "complete_job", **log_ctx):
-            complete_job(
+        with timed_stage(_logger, "complete_job", log_ctx):
+            await asyncio.to_thread(
+                complete_job,
                 config.tilejobs_table,
                 run_id,
                 tile_id,
                 s3_bucket=s3_bucket,
                 s3_key=s3_key,
-                status_ai=agent_output.status.value,
+                status_ai=status_value,
                 reasoning=agent_output.reasoning,
                 openai_usage=usage_dict,
                 claimed_at_epoch=claimed_at_epoch,
             )
 
         # Step 6: Update run counters
-        with timed_stage(_logger, "update_counters", **log_ctx):
-            update_run_counters(config.runs_table, run_id, completed_delta=1)
+        with timed_stage(_logger, "update_counters", log_ctx):
+            await asyncio.to_thread(
+                update_run_counters, config.runs_table, run_id, completed_delta=1
+            )
 
         log_structured(
             _logger,
             logging.INFO,
             "Tile processed successfully",
-            status_ai=agent_output.status.value,
+            status_ai=status_value,
             **log_ctx,
         )
 
-        return ProcessTileResult(
-            status="completed",
-            tile_id=tile_id,
-            status_ai=agent_output.status.value,
-            s3_key=s3_key,
-        )
+        return {
+            "status": "completed",
+            "tile_id": tile_id,
+            "status_ai": status_value,
+            "s3_key": s3_key,
+        }
 
     except Exception as exc:
+        if checkpoint_task is not None:
+            # Let an in-flight checkpoint land before failing the job: it's what lets
+            # the SQS retry skip the imagery fetch. _record_checkpoint never raises.
+            await checkpoint_task
         await _handle_failure(exc, message, config, log_ctx)
         raise  # Re-raise to trigger SQS retry
 
+    finally:
+        # Only reachable while pending if process_tile itself was cancelled
+        if checkpoint_task is not None and not checkpoint_task.done():
+            checkpoint_task.cancel()
+
 
 async def _download_from_checkpoint(
     s3_bucket: str,
     s3_key: str,
     log_ctx: dict,
-) -> bytes:
-    """Download image from S3 checkpoint."""
-    with timed_stage(
-        _logger,
-        "download_s3",
-        run_id=log_ctx.get("run_id"),
-        tile_id=log_ctx.get("tile_id"),
-        attempt=log_ctx.get("attempt"),
-    ) as ctx:
-        image_bytes = await download_image(s3_bucket, s3_key)
+) -> bytes | bytearray:
+    """Load image from S3 checkpoint, preferring this environment's /tmp copy."""
+    with timed_stage(_logger, "download_s3", log_ctx) as ctx:
+        image_bytes = await _cache_get(s3_bucket, s3_key, log_ctx)
+        ctx["cache_hit"] = image_bytes is not None
+        if image_bytes is None:
+            image_bytes = await download_image(s3_bucket, s3_key)
+            await _cache_put(s3_bucket, s3_key, image_bytes, log_ctx)
         ctx["bytes"] = len(image_bytes)
         return image_bytes
 
 
+async def _cache_get(s3_bucket: str, s3_key: str, log_ctx: dict) -> bytes | None:
+    """Read the /tmp tile cache from a worker thread; a failed read is a miss."""
+    try:
+        return await asyncio.to_thread(tile_cache.get, s3_bucket, s3_key)
+    except Exception as exc:
+        log_structured(_logger, logging.WARNING, f"Tile cache read failed: {exc}", **log_ctx)
+        return None
+
+
+async def _cache_put(
+    s3_bucket: str,
+    s3_key: str,
+    image_bytes: bytes | bytearray,
+    log_ctx: dict,
+) -> None:
+    """Write the /tmp tile cache from a worker thread; the cache is best-effort."""
+    try:
+        await asyncio.to_thread(tile_cache.put, s3_bucket, s3_key, image_bytes)
+    except Exception as exc:
+        log_structured(_logger, logging.WARNING, f"Tile cache write failed: {exc}", **log_ctx)
+
+
+async def _record_checkpoint(
+    config: WorkerConfig,
+    run_id: str,
+    tile_id: str,
+    s3_bucket: str,
+    s3_key: str,
+    log_ctx: dict,
+) -> None:
+    """Write the S3 checkpoint from a worker thread, logging rather than raising on failure."""
+    try:
+        with timed_stage(_logger, "checkpoint_s3", log_ctx):
+            await asyncio.to_thread(
+                checkpoint_s3,
+                config.tilejobs_table,
+                run_id,
+                tile_id,
+                s3_bucket=s3_bucket,
+                s3_key=s3_key,
+            )
+    except Exception:
+        # timed_stage already logged it; complete_job records the same S3 location,
+        # so a lost checkpoint only costs a refetch if this attempt later fails
+        pass
+
+
 async def _fetch_imagery(
     message: TileJobMessage,
     config: WorkerConfig,
     log_ctx: dict,
 ) -> bytes:
     """Fetch imagery from Mapbox or Google based on message source."""
-    with timed_stage(
-        _logger,
-        "fetch_imagery",
-        run_id=log_ctx.get("run_id"),
-        tile_id=log_ctx.get("tile_id"),
-        attempt=log_ctx.get("attempt"),
-    ) as ctx:
+    with timed_stage(_logger, "fetch_imagery", log_ctx) as ctx:
         if message.imagery_source == "mapbox":
             image_bytes = await fetch_mapbox_tile(
                 message.z,
@@ -218,13 +331,7 @@ async def _upload_to_s3(
     log_ctx: dict,
 ) -> tuple[str, str]:
     """Upload imagery to S3 with deterministic key."""
-    with timed_stage(
-        _logger,
-        "upload_s3",
-        run_id=log_ctx.get("run_id"),
-        tile_id=log_ctx.get("tile_id"),
-        attempt=log_ctx.get("attempt"),
-    ) as ctx:
+    with timed_stage(_logger, "upload_s3", log_ctx) as ctx:
         if message.imagery_source == "mapbox":
             bucket, key = await upload_tile_image(
                 image_bytes,
@@ -246,26 +353,51 @@ async def _upload_to_s3(
                 zoom=message.get_zoom(),
             )
         ctx["s3_key"] = key
+        # Retries of this tile often land on the same warm environment
+        await _cache_put(bucket, key, image_bytes, log_ctx)
         return bucket, key
 
 
 async def _analyze_with_openai(
-    image_bytes: bytes,
+    image_bytes: bytes | bytearray,
     config: WorkerConfig,
     log_ctx: dict,
+    deadline: float | None = None,
 ) -> tuple[AgentOutput, dict]:
-    """Analyze image with OpenAI vision model."""
-    with timed_stage(
-        _logger,
-        "openai",
-        run_id=log_ctx.get("run_id"),
-        tile_id=log_ctx.get("tile_id"),
-        attempt=log_ctx.get("attempt"),
-    ) as ctx:
-        agent_output, usage_dict = await analyze_image(
-            image_bytes,
-            secrets_id=config.secrets_id,
-        )
+    """
+    Analyze image with OpenAI vision model.
+
+    Transient API failures are retried here while the image is still in memory,
+    rather than through an SQS redelivery (visibility timeout, re-claim, re-download).
+    No retry starts unless MIN_REMAINING_MS_FOR_OPENAI would remain before `deadline`.
+    """
+    with timed_stage(_logger, "openai", log_ctx) as ctx:
+        backoff = _OPENAI_BACKOFF_BASE_SECONDS
+        for retry in range(_OPENAI_RETRIES + 1):
+            try:
+                agent_output, usage_dict = await analyze_image(
+                    image_bytes,
+                    secrets_id=config.secrets_id,
+                )
+                break
+            except AnalysisError as exc:
+                if not exc.retryable or retry == _OPENAI_RETRIES:
+                    raise
+                backoff = decorrelated_backoff(backoff, base=_OPENAI_BACKOFF_BASE_SECONDS)
+                if deadline is not None:
+                    remaining_ms = (deadline - time.monotonic() - backoff) * 1000
+                    if remaining_ms < MIN_REMAINING_MS_FOR_OPENAI:
+                        raise
+                log_structured(
+                    _logger,
+                    logging.WARNING,
+                    f"OpenAI call failed, retrying: {exc}",
+                    retry=retry + 1,
+                    backoff_ms=round(backoff * 1000),
+                    **log_ctx,
+                )
+                await asyncio.sleep(backoff)
+        ctx["retries"] = retry
         ctx["status_ai"] = agent_output.status.value
         ctx["tokens"] = usage_dict.get("total_tokens")
         return agent_output, usage_dict
@@ -279,7 +411,7 @@ async def _handle_failure(
 ) -> None:
     """Handle tile processing failure: update DynamoDB, log error."""
     run_id = message.run_id
-    tile_id = message.get_tile_id()
+    tile_id = message.tile_id
 
     error_code = _exception_to_error_code(exc, message.imagery_source)
     error_message = str(exc)[:500]
@@ -293,14 +425,15 @@ async def _handle_failure(
     )
 
     try:
-        fail_job(
+        await asyncio.to_thread(
+            fail_job,
             config.tilejobs_table,
             run_id,
             tile_id,
             error_code=error_code.value,
             error_message=error_message,
         )
-        update_run_counters(config.runs_table, run_id, failed_delta=1)
+        await asyncio.to_thread(update_run_counters, config.runs_table, run_id, failed_delta=1)
     except Exception as ddb_exc:
         log_structured(
             _logger,
@@ -310,20 +443,53 @@ async def _handle_failure(
         )
 
 
-def _exception_to_error_code(exc: Exception, imagery_source: str) -> ErrorCode:  # noqa: ARG001
-    """Map an exception to an ErrorCode for DynamoDB storage."""
-    if isinstance(exc, ImageryFetchError):
-        if exc.status_code is not None:
-            return error_code_from_http_status(exc.source, exc.status_code)
-        return ErrorCode(f"{exc.source.upper()}_TIMEOUT")
+# An ImageryFetchError without a status code never got a response
+_IMAGERY_TIMEOUT_CODES = {
+    "mapbox": ErrorCode.MAPBOX_TIMEOUT,
+    "google": ErrorCode.GOOGLE_TIMEOUT,
+}
+
 
-    if isinstance(exc, AnalysisError):
-        return ErrorCode.OPENAI_BAD_RESPONSE
+def _imagery_error_code(exc: ImageryFetchError) -> ErrorCode:
+    if exc.status_code is None:
+        return _IMAGERY_TIMEOUT_CODES[exc.source]
+    return error_code_from_http_status(exc.source, exc.status_code)
 
-    if isinstance(exc, TimeoutError):
-        return ErrorCode.DEADLINE_EXCEEDED
 
-    if "S3" in type(exc).__name__ or "s3" in str(exc).lower():
+def _analysis_error_code(exc: AnalysisError) -> ErrorCode:
+    # Mapped here rather than via error_code_from_http_status: OpenAI has no
+    # BAD_REQUEST code, so a 400 lands in OPENAI_4XX with the other rejections
+    if exc.status_code == 429:
+        return ErrorCode.OPENAI_429
+    if exc.status_code is not None:
+        if exc.status_code >= 500:
+            return ErrorCode.OPENAI_5XX
+        return ErrorCode.OPENAI_4XX
+    # Retryable failures without a status never got a response
+    if exc.retryable:
+        return ErrorCode.OPENAI_TIMEOUT
+    return ErrorCode.OPENAI_BAD_RESPONSE
+
+
+# Looked up along the exception's MRO, so subclasses map like their base
+_ERROR_CODE_BY_TYPE: dict[type[BaseException], Callable[[Any], ErrorCode]] = {
+    ImageryFetchError: _imagery_error_code,
+    AnalysisError: _analysis_error_code,
+    TimeoutError: lambda exc: ErrorCode.DEADLINE_EXCEEDED,
+}
+
+
+def _exception_to_error_code(exc: Exception, imagery_source: str) -> ErrorCode:  # noqa: ARG001
+    """Map an exception to an ErrorCode for DynamoDB storage."""
+    for exc_type in type(exc).__mro__:
+        to_code = _ERROR_CODE_BY_TYPE.get(exc_type)
+        if to_code is not None:
+            return to_code(exc)
+
+    if "S3" in type(exc).__name__:
+        return ErrorCode.S3_PUT_FAILED
+    # Only AWS client errors are worth scanning for an S3 operation in the message
+    if type(exc).__module__.startswith("botocore") and "s3" in str(exc).lower():
         return ErrorCode.S3_PUT_FAILED
 
     return ErrorCode.UNKNOWN_ERROR
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Literal
+from functools import cached_property
+from typing import Literal, NotRequired, TypedDict
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -50,12 +52,14 @@ class TileJobMessage(BaseModel):
             raise ValueError("Google messages require lat and lon")
         return self
 
-    def get_tile_id(self) -> str:
+    @cached_property
+    def tile_id(self) -> str:
         """
-        Compute the canonical tile_id for this message.
+        The canonical tile_id for this message.
 
-        Always computes from coordinates (z/x/y or lat/lon/zoom) to ensure
-        consistency. The tile_id field is ignored to prevent mismatched keys.
+        Always computed from coordinates (z/x/y or lat/lon/zoom) to ensure
+        consistency; a tile_id in the message body is ignored to prevent
+        mismatched keys. The message is frozen, so it's computed once.
         """
         if self.imagery_source == "mapbox":
             return f"{self.z}/{self.x}/{self.y}"
@@ -63,6 +67,10 @@ class TileJobMessage(BaseModel):
             self.lat, self.lon, self.zoom if self.zoom is not None else DEFAULT_GOOGLE_ZOOM
         )
 
+    def get_tile_id(self) -> str:
+        """Compute the canonical tile_id for this message (see `tile_id`)."""
+        return self.tile_id
+
     def get_zoom(self) -> int:
         """Get zoom level, using default for Google if not specified."""
         if self.zoom is not None:
@@ -84,16 +92,19 @@ class JobStatus(str, Enum):
     FAILED = "FAILED"
 
 
+# Precision baked in once: a single %-format, no nested format-spec parsing per call
+_COORD_TILE_ID_FMT = "coord:%%.%df,%%.%df,%%d" % (COORD_TILE_ID_PRECISION, COORD_TILE_ID_PRECISION)
+
+
 def tile_id_for_coords(lat: float, lon: float, zoom: int) -> str:
-    lat_str = f"{lat:.{COORD_TILE_ID_PRECISION}f}"
-    lon_str = f"{lon:.{COORD_TILE_ID_PRECISION}f}"
-    return f"coord:{lat_str},{lon_str},{zoom}"
+    return _COORD_TILE_ID_FMT % (lat, lon, zoom)
 
 
 class RunItem(BaseModel):
     run_id: str
     status: RunStatus
-    total_tiles: int = Field(..., ge=0)
+    # Unset until ingestion finishes and set_total_tiles records the count
+    total_tiles: int | None = Field(None, ge=0)
     completed_tiles: int = Field(0, ge=0)
     failed_tiles: int = Field(0, ge=0)
     source_bucket: str
@@ -102,7 +113,8 @@ class RunItem(BaseModel):
     finished_at_epoch: int | None = Field(None, ge=0)
 
 
-class S3Checkpoint(BaseModel):
+@dataclass(frozen=True, slots=True)
+class S3Checkpoint:
     """S3 location for a checkpointed tile image."""
 
     bucket: str
@@ -117,7 +129,10 @@ class ClaimResult(str, Enum):
     LOCKED_BY_OTHER = "locked_by_other"
 
 
-class ClaimResultData(BaseModel):
+# Built only by claim_job from DynamoDB responses, so a plain dataclass skips
+# pydantic validation on every claim
+@dataclass(frozen=True, slots=True)
+class ClaimResultData:
     """Result of attempting to claim a job."""
 
     result: ClaimResult
@@ -127,14 +142,14 @@ class ClaimResultData(BaseModel):
     checkpoint: S3Checkpoint | None = None
 
 
-class ProcessTileResult(BaseModel):
-    """Result of processing a single tile."""
+class ProcessTileResult(TypedDict):
+    """Result of processing a single tile. Built only by process_tile, so left unvalidated."""
 
     status: Literal["completed", "skipped"]
-    tile_id: str | None = None
-    status_ai: str | None = None
-    s3_key: str | None = None
-    reason: str | None = None
+    tile_id: str
+    status_ai: NotRequired[str]
+    s3_key: NotRequired[str]
+    reason: NotRequired[str]
 
 
 class TileJobItem(BaseModel):
@@ -4,20 +4,25 @@ Tile Worker Lambda Handler
 Processes SQS messages containing tile job requests.
 Each message triggers: claim → fetch imagery → upload S3 → analyze → complete/fail.
 
-Event source: SQS queue with batch_size=1
+Event source: SQS queue with batch_size>1 and ReportBatchItemFailures; the
+records of a batch are processed concurrently and only failed ones are retried.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import os
 from typing import Any
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
+from pyrolysis_aws.core.aws_clients import get_secret_json
+from pyrolysis_aws.core.aws_clients.boto import ddb
 from pyrolysis_aws.core.config import WorkerConfig
+from pyrolysis_aws.core.io import warm_s3_client
 from pyrolysis_aws.core.logging import get_logger, log_structured
+from pyrolysis_aws.core.openai import warm_http_client
 from pyrolysis_aws.core.pipeline import process_tile
 from pyrolysis_aws.core.schema import TileJobMessage
 
@@ -25,6 +30,23 @@ from pyrolysis_aws.core.schema import TileJobMessage
 _config: WorkerConfig | None = None
 _logger = get_logger(__name__)
 
+# Built once per environment; validating through it skips the per-call model
+# class dispatch of TileJobMessage.model_validate_json
+_MESSAGE_ADAPTER = TypeAdapter(TileJobMessage)
+
+# Stage limits per invocation. Fetches run a few ahead of the OpenAI stage so a
+# tile's imagery is ready when a slot frees, without a batch of 10 opening every
+# imagery connection at once
+_FETCH_CONCURRENCY = 8
+_OPENAI_CONCURRENCY = 5
+
+# Upper bound on cold-start warm-up, well inside Lambda's 10 s INIT allowance
+_WARM_TIMEOUT_SECONDS = 3.0
+
+# One event loop per environment, so loop-bound clients (e.g. the imagery
+# aiohttp session) survive across warm invocations; asyncio.run would close it.
+_loop: asyncio.AbstractEventLoop | None = None
+
 
 def _get_config() -> WorkerConfig:
     """Get or load the worker config (singleton per Lambda environment)."""
@@ -34,31 +56,57 @@ def _get_config() -> WorkerConfig:
     return _config
 
 
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or create the persistent event loop for this Lambda environment."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+async def _warm_connections(config: WorkerConfig) -> None:
+    """Open the S3, DynamoDB and OpenAI connections and load secrets ahead of the first tile."""
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            warm_s3_client(config.s3_bucket),
+            asyncio.to_thread(ddb.describe_table, TableName=config.tilejobs_table),
+            asyncio.to_thread(get_secret_json, config.secrets_id),
+            warm_http_client(),
+            return_exceptions=True,
+        ),
+        timeout=_WARM_TIMEOUT_SECONDS,
+    )
+    for name, result in zip(("s3", "dynamodb", "secrets", "openai"), results):
+        if isinstance(result, BaseException):
+            _logger.warning("Cold-start warm-up of %s failed: %s", name, result)
+
+
+def _warm_on_init() -> None:
+    """Run the warm-up during Lambda INIT, on the loop the handler will reuse."""
+    try:
+        _get_loop().run_until_complete(_warm_connections(_get_config()))
+    except Exception as exc:
+        # Warm-up is an optimization only; the first invocation simply pays the cost
+        _logger.warning("Cold-start warm-up skipped: %s", exc)
+
+
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     Lambda entry point for SQS tile job processing.
 
     Args:
-        event: SQS event with Records array (batch_size=1)
+        event: SQS event with a Records array
         context: Lambda context with get_remaining_time_in_millis()
 
     Returns:
-        dict with processing status
+        SQS partial batch response: {"batchItemFailures": [{"itemIdentifier": ...}]}
     """
-    return asyncio.run(_async_handler(event, context))
-
+    return _get_loop().run_until_complete(_async_handler(event, context))
 
-async def _async_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Async implementation of the Lambda handler."""
-    config = _get_config()
-    records = event.get("Records", [])
-
-    if not records:
-        _logger.warning("No records in SQS event")
-        return {"status": "no_records"}
 
-    # With batch_size=1, we expect exactly one record
-    record = records[0]
+def _parse_record(record: dict[str, Any]) -> TileJobMessage | None:
+    """Parse one SQS record, or return None if it can never be processed."""
     message_id = record.get("messageId", "unknown")
 
     log_structured(
@@ -69,10 +117,10 @@ async def _async_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     )
 
     try:
-        # Parse and validate the message body
-        body = json.loads(record.get("body", "{}"))
-        message = TileJobMessage.model_validate(body)
-    except (json.JSONDecodeError, ValidationError) as exc:
+        # Parse and validate the message body in one pass in pydantic-core;
+        # malformed JSON surfaces as a ValidationError too
+        return _MESSAGE_ADAPTER.validate_json(record.get("body") or "{}")
+    except ValidationError as exc:
         log_structured(
             _logger,
             logging.ERROR,
@@ -80,15 +128,65 @@ async def _async_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             message_id=message_id,
         )
         # Don't retry malformed messages - they'll never succeed
-        # Return success so SQS deletes it (or configure DLQ for inspection)
-        return {"status": "invalid_message", "error": str(exc)}
+        # Leave them out of batchItemFailures so SQS deletes them (or configure DLQ for inspection)
+        return None
 
-    # Get remaining time for time budgeting
+
+async def _async_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """Async implementation of the Lambda handler."""
+    config = _get_config()
+    records = event.get("Records", [])
+
+    if not records:
+        _logger.warning("No records in SQS event")
+        return {"batchItemFailures": []}
+
+    # Get remaining time for time budgeting; the batch shares one deadline
     remaining_ms = None
     if hasattr(context, "get_remaining_time_in_millis"):
         remaining_ms = context.get_remaining_time_in_millis()
 
-    # Process the tile (will raise on failure to trigger SQS retry)
-    result = await process_tile(message, config, remaining_time_ms=remaining_ms)
+    # Fetch and OpenAI stages are limited separately, so while some tiles wait on
+    # OpenAI the others' imagery fetches and uploads are already in flight
+    fetch_semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+    openai_semaphore = asyncio.Semaphore(_OPENAI_CONCURRENCY)
+
+    message_ids: list[str] = []
+    tasks = []
+    for record in records:
+        message = _parse_record(record)
+        if message is None:
+            continue
+        message_ids.append(record.get("messageId", "unknown"))
+        tasks.append(
+            process_tile(
+                message,
+                config,
+                remaining_time_ms=remaining_ms,
+                fetch_semaphore=fetch_semaphore,
+                openai_semaphore=openai_semaphore,
+            )
+        )
+
+    # process_tile raises on failure; those records are reported back for SQS retry
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failures = [
+        {"itemIdentifier": message_id}
+        for message_id, result in zip(message_ids, results)
+        if isinstance(result, BaseException)
+    ]
+
+    log_structured(
+        _logger,
+        logging.INFO,
+        "Processed SQS batch",
+        records=len(records),
+        failed=len(failures),
+    )
+
+    return {"batchItemFailures": failures}
+
 
-    return result.model_dump()
+# Only inside Lambda, so importing the module locally stays free of network calls
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    _warm_on_init()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The Lambda image copies src/pyrolysis_aws to the task root; mirror that here
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
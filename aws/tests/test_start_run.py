@@ -0,0 +1,66 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from pyrolysis_aws.core.schema import TileJobMessage
+
+# scripts/ isn't a package; load the ingestion script as a module
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "start_run.py"
+_spec = importlib.util.spec_from_file_location("start_run", _SCRIPT)
+start_run = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(start_run)
+
+_RUN = {
+    "run_id": "run_50%_done",
+    "source_bucket": "bucket",
+    "source_key": 'dir/"quoted"\\tiles.csv',
+}
+
+
+def _messages(source, rows):
+    bodies = list(start_run._iter_messages(rows, source=source, **_RUN))
+    return [TileJobMessage.model_validate_json(body) for body in bodies], bodies
+
+
+@pytest.mark.parametrize(
+    ("row", "expected"),
+    [
+        (["12", "345", "678"], {"z": 12, "x": 345, "y": 678, "region": None}),
+        (["12", "345", "678", 'north "A"\\b'], {"z": 12, "x": 345, "y": 678, "region": 'north "A"\\b'}),
+    ],
+)
+def test_mapbox_bodies_round_trip(row, expected):
+    (message,), (body,) = _messages("mapbox", [row])
+    assert message.run_id == _RUN["run_id"]
+    assert message.source.key == _RUN["source_key"]
+    assert {field: getattr(message, field) for field in expected} == expected
+    assert json.loads(body) == message.model_dump(mode="json", exclude_none=True)
+
+
+@pytest.mark.parametrize(
+    ("row", "expected"),
+    [
+        (["1e-05", "-0.0"], {"lat": 1e-05, "lon": -0.0, "zoom": None}),
+        (["-33.8688", "151.2093", "18"], {"lat": -33.8688, "lon": 151.2093, "zoom": 18}),
+        (["90", "-180", "0"], {"lat": 90.0, "lon": -180.0, "zoom": 0}),
+    ],
+)
+def test_google_bodies_round_trip(row, expected):
+    (message,), (body,) = _messages("google", [row])
+    assert message.imagery_source == "google"
+    assert {field: getattr(message, field) for field in expected} == expected
+    assert json.loads(body) == message.model_dump(mode="json", exclude_none=True)
+
+
+@pytest.mark.parametrize("row", [["nan", "1"], ["1", "inf"], ["91", "0"], ["0", "0", "23"]])
+def test_google_rows_out_of_range_are_rejected(row):
+    with pytest.raises(ValueError):
+        _messages("google", [row])
+
+
+@pytest.mark.parametrize("row", [["23", "0", "0"], ["1", "-1", "0"], ["1", "0", "-1"]])
+def test_mapbox_rows_out_of_range_are_rejected(row):
+    with pytest.raises(ValueError):
+        _messages("mapbox", [row])
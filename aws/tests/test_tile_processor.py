@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from pyrolysis_aws.core.errors import ErrorCode
+from pyrolysis_aws.core.openai import AnalysisError, analyze_image
+from pyrolysis_aws.core.pipeline.tile_processor import _exception_to_error_code
+
+
+class _RejectingAgent:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+
+    async def run(self, prompt):
+        raise ModelHTTPError(self.status_code, "gpt-5-mini", body={"error": "rejected"})
+
+
+def _analysis_error(status_code: int) -> AnalysisError:
+    with pytest.raises(AnalysisError) as excinfo:
+        asyncio.run(
+            analyze_image(b"\xff\xd8\xff", secrets_id="unused", agent=_RejectingAgent(status_code))
+        )
+    return excinfo.value
+
+
+def test_openai_400_maps_to_4xx():
+    exc = _analysis_error(400)
+    assert not exc.retryable
+    assert _exception_to_error_code(exc, "mapbox") == ErrorCode.OPENAI_4XX
+
+
+@pytest.mark.parametrize(
+    ("status_code", "expected"),
+    [(403, ErrorCode.OPENAI_4XX), (429, ErrorCode.OPENAI_429), (503, ErrorCode.OPENAI_5XX)],
+)
+def test_openai_http_status_codes(status_code, expected):
+    assert _exception_to_error_code(_analysis_error(status_code), "google") == expected
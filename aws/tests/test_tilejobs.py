@@ -0,0 +1,50 @@
+from typing import Any
+
+import pytest
+
+from pyrolysis_aws.core.ddb.tilejobs import _serialize_map
+
+
+def _legacy_to_ddb_map(payload: dict) -> dict[str, Any]:
+    """The hand-rolled serializer _serialize_map replaced, kept as the reference."""
+    converted: dict[str, Any] = {}
+    for key, value in payload.items():
+        if value is None:
+            continue
+        converted[key] = _legacy_to_ddb_value(value)
+    return converted
+
+
+def _legacy_to_ddb_value(value: Any) -> dict[str, Any]:
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": _legacy_to_ddb_map(value)}
+    if isinstance(value, list):
+        return {"L": [_legacy_to_ddb_value(item) for item in value]}
+    return {"S": str(value)}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"input_tokens": 1200, "output_tokens": 85, "total_tokens": 1285, "model": "gpt-5-mini"},
+        {"requests": 1, "cache_read_tokens": None, "details": {"reasoning_tokens": 64, "audio": None}},
+        {"details": {"nested": {"keep": "x", "drop": None}}, "flag": True},
+        {"details": {"cost": 0.25, "ratio": 1.5}, "items": [1, "a", None]},
+    ],
+)
+def test_serialize_map_matches_legacy(payload):
+    assert _serialize_map(payload) == {"M": _legacy_to_ddb_map(payload)}
+
+
+def test_serialize_map_accepts_floats():
+    assert _serialize_map({"details": {"cost": 0.25}}) == {
+        "M": {"details": {"M": {"cost": {"N": "0.25"}}}}
+    }